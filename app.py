@@ -1,11 +1,39 @@
-from flask import Flask, request, jsonify, render_template_string, redirect, url_for, session
+from flask import Flask, request, jsonify, render_template, redirect, url_for, session, abort, stream_with_context, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
+from jinja2 import DictLoader, FileSystemBytecodeCache
+from assets import DIST_DIR, build_assets, load_manifest, manifest_is_stale, source_files
+from media import MediaStore, MEDIA_NAME_RE, build_all_variants, http_fetcher, directory_fetcher
 import os
-from datetime import datetime
-from sqlalchemy import create_engine, text
+import ast
+import atexit
+import click
+import functools
+import gzip
+import sqlite3
+import hashlib
+import json
+import mimetypes
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, text, func, select, insert, delete, case, or_, Integer, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 CORS(app, 
@@ -21,122 +49,7 @@ HTML_TEMPLATE = '''
 <head>
     <title>Sistema de Aprendizaje</title>
     <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        body {
-            min-height: 100vh;
-            background: #E3F2FD;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }
-
-        .auth-container {
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.2);
-            overflow: hidden;
-            width: 100%;
-            max-width: 900px;
-            display: flex;
-        }
-
-        .auth-form {
-            padding: 40px;
-            width: 50%;
-            background: white;
-        }
-
-        .auth-info {
-            padding: 40px;
-            width: 50%;
-            background: #0091FF;
-            color: white;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            align-items: center;
-            text-align: center;
-        }
-
-        h1 {
-            color: #0091FF;
-            font-size: 2em;
-            margin-bottom: 30px;
-            font-weight: 600;
-        }
-
-        .form-group {
-            margin-bottom: 25px;
-        }
-
-        input {
-            width: 100%;
-            padding: 15px;
-            border: 2px solid #e1e1e1;
-            border-radius: 10px;
-            font-size: 1em;
-            transition: all 0.3s ease;
-        }
-
-        input:focus {
-            outline: none;
-            border-color: #0091FF;
-            box-shadow: 0 0 0 3px rgba(0, 145, 255, 0.1);
-        }
-
-        button {
-            width: 100%;
-            padding: 15px;
-            border: none;
-            border-radius: 10px;
-            background: #0091FF;
-            color: white;
-            font-size: 1em;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-
-        button:hover {
-            background: #007acc;
-            transform: translateY(-2px);
-        }
-
-        @media (max-width: 768px) {
-            .auth-container {
-                flex-direction: column;
-            }
-
-            .auth-form, .auth-info {
-                width: 100%;
-            }
-        }
-
-        .error-message {
-            color: #e74c3c;
-            background: #ffd7d7;
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-            display: none;
-        }
-        .success-message {
-            color: #27ae60;
-            background: #d4ffda;
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-            display: none;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/home.css') }}">
 </head>
 <body>
     <div class="auth-container" id="authContainer">
@@ -183,96 +96,7 @@ HTML_TEMPLATE = '''
         </div>
     </div>
 
-    <script>
-        let isLoginForm = true;
-
-        function toggleForms() {
-            const loginForm = document.getElementById('loginForm');
-            const registerForm = document.getElementById('registerForm');
-            const authInfo = document.querySelector('.auth-info');
-
-            if (isLoginForm) {
-                loginForm.style.display = 'none';
-                registerForm.style.display = 'block';
-                authInfo.innerHTML = `
-                    <h2>¿Ya tienes una cuenta?</h2>
-                    <p>Inicia sesión para continuar aprendiendo</p>
-                    <button onclick="toggleForms()" style="background: white; color: #0091FF;">Iniciar Sesión</button>
-                `;
-            } else {
-                loginForm.style.display = 'block';
-                registerForm.style.display = 'none';
-                authInfo.innerHTML = `
-                    <h2>¿Aún no tienes una cuenta?</h2>
-                    <p>Regístrate para que puedas iniciar sesión</p>
-                    <button onclick="toggleForms()" style="background: white; color: #0091FF;">Registrarse</button>
-                `;
-            }
-            isLoginForm = !isLoginForm;
-        }
-
-        async function handleLogin(event) {
-            event.preventDefault();
-            const form = event.target;
-            const formData = new FormData(form);
-            const data = Object.fromEntries(formData.entries());
-
-            try {
-                const response = await fetch('/login', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(data)
-                });
-
-                if (response.ok) {
-                    document.getElementById('loginSuccess').style.display = 'block';
-                    document.getElementById('loginSuccess').textContent = '¡Inicio de sesión exitoso!';
-                    window.location.href = '/dashboard';
-                } else {
-                    const error = await response.json();
-                    document.getElementById('loginError').style.display = 'block';
-                    document.getElementById('loginError').textContent = error.error || 'Error al iniciar sesión';
-                }
-            } catch (error) {
-                document.getElementById('loginError').style.display = 'block';
-                document.getElementById('loginError').textContent = 'Error de conexión';
-            }
-        }
-
-        async function handleRegister(event) {
-            event.preventDefault();
-            const form = event.target;
-            const formData = new FormData(form);
-            const data = Object.fromEntries(formData.entries());
-
-            try {
-                const response = await fetch('/register', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(data)
-                });
-
-                if (response.ok) {
-                    document.getElementById('registerSuccess').style.display = 'block';
-                    document.getElementById('registerSuccess').textContent = '¡Registro exitoso! Redirigiendo...';
-                    setTimeout(() => {
-                        toggleForms();
-                    }, 2000);
-                } else {
-                    const error = await response.json();
-                    document.getElementById('registerError').style.display = 'block';
-                    document.getElementById('registerError').textContent = error.error || 'Error al registrarse';
-                }
-            } catch (error) {
-                document.getElementById('registerError').style.display = 'block';
-                document.getElementById('registerError').textContent = 'Error de conexión';
-            }
-        }
-    </script>
+    <script src="{{ asset_url('js/home.js') }}"></script>
 </body>
 </html>
 '''
@@ -284,169 +108,7 @@ DASHBOARD_TEMPLATE = '''
 <head>
     <title>Dashboard - Sistema de Aprendizaje</title>
     <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        body {
-            min-height: 100vh;
-            background: #E3F2FD;
-            padding: 20px;
-        }
-
-        .navbar {
-            background: white;
-            padding: 15px 30px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 30px;
-        }
-
-        .nav-links {
-            display: flex;
-            gap: 20px;
-        }
-
-        .nav-link {
-            color: #333;
-            text-decoration: none;
-            padding: 8px 15px;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-        }
-
-        .nav-link:hover {
-            background: #0091FF;
-            color: white;
-        }
-
-        .user-info {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }
-
-        .user-photo {
-            width: 40px;
-            height: 40px;
-            border-radius: 50%;
-            object-fit: cover;
-        }
-
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            padding: 20px;
-        }
-
-        .card {
-            background: white;
-            border-radius: 20px;
-            padding: 30px;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-            transition: all 0.3s ease;
-        }
-
-        .card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 15px 30px rgba(0, 0, 0, 0.15);
-        }
-
-        .card-header {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-
-        .card-icon {
-            font-size: 2em;
-        }
-
-        .card-title {
-            font-size: 1.5em;
-            font-weight: 600;
-            color: #333;
-        }
-
-        .card-description {
-            color: #666;
-            margin-bottom: 20px;
-            line-height: 1.6;
-        }
-
-        .progress-bar {
-            width: 100%;
-            height: 10px;
-            background: #e1e1e1;
-            border-radius: 5px;
-            overflow: hidden;
-            margin-bottom: 10px;
-        }
-
-        .progress-fill {
-            height: 100%;
-            background: #0091FF;
-            border-radius: 5px;
-            transition: width 0.3s ease;
-        }
-
-        .progress-text {
-            display: flex;
-            justify-content: space-between;
-            color: #666;
-            font-size: 0.9em;
-        }
-
-        .start-button {
-            display: inline-block;
-            padding: 12px 25px;
-            background: #0091FF;
-            color: white;
-            border-radius: 10px;
-            text-decoration: none;
-            margin-top: 20px;
-            transition: all 0.3s ease;
-        }
-
-        .start-button:hover {
-            background: #007acc;
-            transform: translateY(-2px);
-        }
-
-        .completed {
-            background: #4CAF50;
-        }
-
-        @media (max-width: 768px) {
-            .navbar {
-                flex-direction: column;
-                gap: 15px;
-                text-align: center;
-            }
-
-            .nav-links {
-                flex-direction: column;
-            }
-
-            .grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/dashboard.css') }}">
 </head>
 <body>
     <nav class="navbar">
@@ -500,147 +162,7 @@ PROFILE_TEMPLATE = '''
 <head>
     <title>Perfil - Sistema de Aprendizaje</title>
     <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        body {
-            min-height: 100vh;
-            background: #E3F2FD;
-            padding: 20px;
-        }
-
-        .navbar {
-            background: white;
-            padding: 15px 30px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 30px;
-        }
-
-        .nav-links {
-            display: flex;
-            gap: 20px;
-        }
-
-        .nav-link {
-            color: #333;
-            text-decoration: none;
-            padding: 8px 15px;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-        }
-
-        .nav-link:hover {
-            background: #0091FF;
-            color: white;
-        }
-
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-        }
-
-        .profile-header {
-            display: flex;
-            align-items: center;
-            gap: 30px;
-            margin-bottom: 40px;
-        }
-
-        .profile-photo {
-            width: 150px;
-            height: 150px;
-            border-radius: 50%;
-            object-fit: cover;
-            border: 5px solid #0091FF;
-        }
-
-        .profile-info h1 {
-            font-size: 2em;
-            color: #333;
-            margin-bottom: 10px;
-        }
-
-        .profile-info p {
-            color: #666;
-            font-size: 1.1em;
-        }
-
-        .form-group {
-            margin-bottom: 25px;
-        }
-
-        label {
-            display: block;
-            margin-bottom: 8px;
-            color: #333;
-            font-weight: 500;
-        }
-
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #e1e1e1;
-            border-radius: 10px;
-            font-size: 1em;
-            transition: all 0.3s ease;
-        }
-
-        input:focus {
-            outline: none;
-            border-color: #0091FF;
-            box-shadow: 0 0 0 3px rgba(0, 145, 255, 0.1);
-        }
-
-        button {
-            padding: 12px 25px;
-            background: #0091FF;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            font-size: 1em;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-
-        button:hover {
-            background: #007acc;
-            transform: translateY(-2px);
-        }
-
-        @media (max-width: 768px) {
-            .navbar {
-                flex-direction: column;
-                gap: 15px;
-            text-align: center;
-            }
-
-            .nav-links {
-                flex-direction: column;
-            }
-
-            .profile-header {
-                flex-direction: column;
-                text-align: center;
-            }
-
-            .container {
-                padding: 20px;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/profile.css') }}">
 </head>
 <body>
     <nav class="navbar">
@@ -696,147 +218,7 @@ PROGRESS_TEMPLATE = '''
 <head>
     <title>Progreso - Sistema de Aprendizaje</title>
     <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        body {
-            min-height: 100vh;
-            background: #E3F2FD;
-            padding: 20px;
-        }
-
-        .navbar {
-            background: white;
-            padding: 15px 30px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 30px;
-        }
-
-        .nav-links {
-            display: flex;
-            gap: 20px;
-        }
-
-        .nav-link {
-            color: #333;
-            text-decoration: none;
-            padding: 8px 15px;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-        }
-
-        .nav-link:hover {
-            background: #0091FF;
-            color: white;
-        }
-
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-
-        .progress-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            padding: 20px;
-        }
-
-        .progress-card {
-            background: white;
-            border-radius: 20px;
-            padding: 30px;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-        }
-
-        .progress-header {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-
-        .progress-icon {
-            font-size: 2em;
-        }
-
-        .progress-title {
-            font-size: 1.5em;
-            font-weight: 600;
-            color: #333;
-        }
-
-        .progress-bar {
-            width: 100%;
-            height: 10px;
-            background: #e1e1e1;
-            border-radius: 5px;
-            overflow: hidden;
-            margin: 20px 0;
-        }
-
-        .progress-fill {
-            height: 100%;
-            background: #0091FF;
-            border-radius: 5px;
-            transition: width 0.3s ease;
-        }
-
-        .stats {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-top: 20px;
-        }
-
-        .stat-item {
-            background: #f5f5f5;
-            padding: 15px;
-            border-radius: 10px;
-            text-align: center;
-        }
-
-        .stat-value {
-            font-size: 1.5em;
-            font-weight: 600;
-            color: #333;
-            margin-bottom: 5px;
-        }
-
-        .stat-label {
-            color: #666;
-            font-size: 0.9em;
-        }
-
-        @media (max-width: 768px) {
-            .navbar {
-                flex-direction: column;
-                gap: 15px;
-            text-align: center;
-        }
-
-            .nav-links {
-                flex-direction: column;
-            }
-
-            .progress-grid {
-                grid-template-columns: 1fr;
-            }
-
-            .stats {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/progress.css') }}">
 </head>
 <body>
     <nav class="navbar">
@@ -894,186 +276,7 @@ FLASHCARD_TEMPLATE = '''
 <head>
     <title>Aprendizaje - Sistema de Aprendizaje</title>
     <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        body {
-            min-height: 100vh;
-            background: #E3F2FD;
-            padding: 20px;
-        }
-
-        .navbar {
-            background: white;
-            padding: 15px 30px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 30px;
-        }
-
-        .nav-links {
-            display: flex;
-            gap: 20px;
-        }
-
-        .nav-link {
-            color: #333;
-            text-decoration: none;
-            padding: 8px 15px;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-        }
-
-        .nav-link:hover {
-            background: #0091FF;
-            color: white;
-        }
-
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-        }
-
-        .flashcard {
-            background: white;
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-            margin-bottom: 30px;
-            text-align: center;
-        }
-
-        .flashcard img {
-            max-width: 300px;
-            height: auto;
-            margin: 20px 0;
-            border-radius: 10px;
-        }
-
-        .question {
-            font-size: 1.5em;
-            color: #333;
-            margin-bottom: 30px;
-        }
-
-        .options {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-
-        .option {
-            padding: 15px;
-            border: 2px solid #e1e1e1;
-            border-radius: 10px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-
-        .option:hover {
-            border-color: #0091FF;
-            background: #f5f5f5;
-        }
-
-        .option.selected {
-            background: #0091FF;
-            color: white;
-            border-color: #0091FF;
-        }
-
-        .option.correct {
-            background: #4CAF50;
-            color: white;
-            border-color: #4CAF50;
-        }
-
-        .option.incorrect {
-            background: #f44336;
-            color: white;
-            border-color: #f44336;
-        }
-
-        .feedback {
-            padding: 20px;
-            border-radius: 10px;
-            margin-top: 20px;
-            display: none;
-        }
-
-        .feedback.correct {
-            background: #E8F5E9;
-            color: #2E7D32;
-            border: 1px solid #A5D6A7;
-        }
-
-        .feedback.incorrect {
-            background: #FFEBEE;
-            color: #C62828;
-            border: 1px solid #FFCDD2;
-        }
-
-        .progress-bar {
-            width: 100%;
-            height: 10px;
-            background: #e1e1e1;
-            border-radius: 5px;
-            overflow: hidden;
-            margin-bottom: 20px;
-        }
-
-        .progress-fill {
-            height: 100%;
-            background: #0091FF;
-            border-radius: 5px;
-            transition: width 0.3s ease;
-        }
-
-        .next-button {
-            padding: 12px 25px;
-            background: #0091FF;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            font-size: 1em;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            display: none;
-        }
-
-        .next-button:hover {
-            background: #007acc;
-            transform: translateY(-2px);
-        }
-
-        @media (max-width: 768px) {
-            .navbar {
-                flex-direction: column;
-                gap: 15px;
-                text-align: center;
-            }
-
-            .nav-links {
-                flex-direction: column;
-            }
-
-            .options {
-                grid-template-columns: 1fr;
-            }
-
-            .flashcard {
-                padding: 20px;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/flashcards.css') }}">
 </head>
 <body>
     <nav class="navbar">
@@ -1092,138 +295,88 @@ FLASHCARD_TEMPLATE = '''
 
         <div class="flashcard" id="flashcard">
             <div class="question" id="question"></div>
-            <img id="questionImage" src="" alt="Imagen de la pregunta">
+            <picture>
+                <source id="questionImageWebp" type="image/webp" sizes="300px">
+                <img id="questionImage" src="" alt="Imagen de la pregunta" sizes="300px" decoding="async">
+            </picture>
             <div class="options" id="options"></div>
             <div class="feedback" id="feedback"></div>
             <button class="next-button" id="nextButton">Siguiente</button>
                 </div>
             </div>
 
-    <script>
-        let currentCardIndex = 0;
-        let cards = [];
-        let score = 0;
-        let selectedOption = null;
-        let category = window.location.pathname.split('/')[1];
-
-        // Elementos del DOM
-        const questionEl = document.getElementById('question');
-        const questionImageEl = document.getElementById('questionImage');
-        const optionsEl = document.getElementById('options');
-        const feedbackEl = document.getElementById('feedback');
-        const nextButton = document.getElementById('nextButton');
-        const progressBar = document.getElementById('progressBar');
-
-        // Cargar las flashcards
-        async function loadFlashcards() {
-            try {
-                const response = await fetch(`/api/flashcards/${category}`);
-                cards = await response.json();
-                showCard(currentCardIndex);
-            } catch (error) {
-                console.error('Error cargando flashcards:', error);
-            }
-        }
-
-        // Mostrar una tarjeta
-        function showCard(index) {
-            if (index >= cards.length) {
-                saveProgress();
-                return;
-            }
-
-            const card = cards[index];
-            questionEl.textContent = card.question;
-            questionImageEl.src = card.image_url;
-            
-            optionsEl.innerHTML = '';
-            card.options.forEach((option, i) => {
-                const button = document.createElement('button');
-                button.className = 'option';
-                button.textContent = option;
-                button.onclick = () => selectOption(i);
-                optionsEl.appendChild(button);
-            });
-
-            feedbackEl.style.display = 'none';
-            nextButton.style.display = 'none';
-            selectedOption = null;
-
-            updateProgressBar();
-        }
-
-        // Seleccionar una opción
-        function selectOption(index) {
-            if (selectedOption !== null) return;
-
-            selectedOption = index;
-            const card = cards[currentCardIndex];
-            const options = document.querySelectorAll('.option');
-
-            options[index].classList.add('selected');
-
-            if (index === card.correct_option) {
-                score++;
-                options[index].classList.add('correct');
-                feedbackEl.className = 'feedback correct';
-                feedbackEl.textContent = card.feedback;
-            } else {
-                options[index].classList.add('incorrect');
-                options[card.correct_option].classList.add('correct');
-                feedbackEl.className = 'feedback incorrect';
-                feedbackEl.textContent = 'Intenta de nuevo. ' + card.feedback;
-            }
-
-            feedbackEl.style.display = 'block';
-            nextButton.style.display = 'block';
-        }
-
-        // Actualizar la barra de progreso
-        function updateProgressBar() {
-            const progress = ((currentCardIndex + 1) / cards.length) * 100;
-            progressBar.style.width = `${progress}%`;
-        }
-
-        // Guardar el progreso
-        async function saveProgress() {
-            const percentage = Math.round((score / cards.length) * 1000) / 10; // Redondear a 1 decimal
-            const completed = currentCardIndex >= cards.length - 1;
-
-            try {
-                const response = await fetch('/save-progress', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        category: category,
-                        score: score,
-                        percentage: percentage,
-                        completed: completed
-                    })
-                });
-
-                if (response.ok) {
-                    window.location.href = '/dashboard';
-                }
-            } catch (error) {
-                console.error('Error guardando progreso:', error);
-            }
-        }
-
-        // Evento para el botón siguiente
-        nextButton.onclick = () => {
-            currentCardIndex++;
-            showCard(currentCardIndex);
-        };
-
-        // Cargar las flashcards al iniciar
-        loadFlashcards();
-    </script>
+    <script src="{{ asset_url('js/flashcards.js') }}" data-answer-batch-max="{{ config['ANSWER_BATCH_MAX'] }}"></script>
 </body>
 </html>
 '''
 
+# Las plantillas se sirven con un loader: Jinja las compila una sola vez por
+# worker y guarda el bytecode en disco para que los workers nuevos arranquen en caliente
+PAGE_TEMPLATES = {
+    'home.html': HTML_TEMPLATE,
+    'dashboard.html': DASHBOARD_TEMPLATE,
+    'profile.html': PROFILE_TEMPLATE,
+    'progress.html': PROGRESS_TEMPLATE,
+    'flashcards.html': FLASHCARD_TEMPLATE,
+}
+app.jinja_loader = DictLoader(PAGE_TEMPLATES)
+
+# Sin TEMPLATE_CACHE_DIR se usa el directorio por defecto de Jinja, que crea
+# con permisos 0700 y comprueba que sea del usuario: en un /tmp compartido otro
+# usuario podría dejar bytecode preparado en un directorio de nombre fijo
+template_cache_dir = os.environ.get('TEMPLATE_CACHE_DIR')
+try:
+    if template_cache_dir:
+        os.makedirs(template_cache_dir, mode=0o700, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(template_cache_dir)
+    else:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+except (OSError, RuntimeError) as e:
+    print(f"Caché de bytecode de plantillas deshabilitada: {e}")
+
+# Archivos estáticos con hash de contenido (ver assets.py). Si el despliegue no
+# los generó, o si se editó algún CSS/JS después de generarlos, se construyen
+# al arrancar.
+asset_manifest = None if manifest_is_stale() else load_manifest()
+if asset_manifest is None:
+    try:
+        asset_manifest = build_assets()
+    except OSError as e:
+        print(f"No se pudieron generar los archivos estáticos: {e}")
+        asset_manifest = {}
+
+@app.template_global()
+def asset_url(name):
+    return url_for('static', filename=asset_manifest.get(name, name))
+
+# Variantes precomprimidas por assets.py, en orden de preferencia
+PRECOMPRESSED_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+def send_static_asset(filename):
+    # Flask sirve los estáticos en modo direct_passthrough, que compress_response
+    # no toca: para static/dist se envía la variante .br/.gz ya generada
+    if filename.startswith(DIST_DIR + '/'):
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+            if request.accept_encodings[encoding] and os.path.isfile(os.path.join(app.static_folder, filename + suffix)):
+                response = send_from_directory(app.static_folder, filename + suffix,
+                                               mimetype=mimetypes.guess_type(filename)[0])
+                response.headers['Content-Encoding'] = encoding
+                response.vary.add('Accept-Encoding')
+                return response
+    return app.send_static_file(filename)
+
+app.view_functions['static'] = send_static_asset
+
+@app.after_request
+def set_static_cache_headers(response):
+    if request.path.startswith('/static/dist/') and not request.path.endswith('.json') \
+            and response.status_code in (200, 304):
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+for template_name in PAGE_TEMPLATES:
+    app.jinja_env.get_template(template_name)
+
 # Configuración
 basedir = os.path.abspath(os.path.dirname(__file__))
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'tu_clave_secreta_aqui')
@@ -1244,16 +397,134 @@ if database_url:
             
     except Exception as e:
         print(f"Error al conectar con la base de datos: {e}")
-        database_url = 'sqlite:///' + os.path.join(basedir, 'autism_learning.db')
+        database_url = 'sqlite:///' + os.environ.get('SQLITE_PATH', os.path.join(basedir, 'autism_learning.db'))
 else:
     print("No se encontró URL de base de datos, usando SQLite")
-    database_url = 'sqlite:///' + os.path.join(basedir, 'autism_learning.db')
+    database_url = 'sqlite:///' + os.environ.get('SQLITE_PATH', os.path.join(basedir, 'autism_learning.db'))
 
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+
+# Pool de conexiones instrumentado: registra cuánto espera cada checkout
+pool_wait_stats = {'waits': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0, 'timeouts': 0}
+pool_wait_lock = threading.Lock()
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with pool_wait_lock:
+                pool_wait_stats['timeouts'] += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - start) * 1000
+            with pool_wait_lock:
+                pool_wait_stats['waits'] += 1
+                pool_wait_stats['total_wait_ms'] += waited_ms
+                pool_wait_stats['max_wait_ms'] = max(pool_wait_stats['max_wait_ms'], waited_ms)
+
+def env_flag(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+if database_url.startswith('postgresql://'):
+    # Cada worker de gunicorn tiene su propio pool: el total de conexiones es
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    engine_options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+    }
+    statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    if statement_timeout_ms > 0:
+        engine_options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    print(f"Pool de conexiones: size={engine_options['pool_size']}, overflow={engine_options['max_overflow']}, "
+          f"recycle={engine_options['pool_recycle']}s, pre_ping={engine_options['pool_pre_ping']}")
+
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SESSION_COOKIE_SECURE'] = True
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+app.config['DECK_CACHE_SIZE'] = int(os.environ.get('DECK_CACHE_SIZE', 256))
+app.config['DECK_PAGE_CACHE_SIZE'] = int(os.environ.get('DECK_PAGE_CACHE_SIZE', 1024))
+app.config['DECK_CACHE_TTL'] = float(os.environ.get('DECK_CACHE_TTL', 300))
+app.config['CATEGORY_REGISTRY_TTL'] = float(os.environ.get('CATEGORY_REGISTRY_TTL', 300))
+app.config['IMAGE_MAP_TTL'] = float(os.environ.get('IMAGE_MAP_TTL', 300))
+app.config['USER_CACHE_SIZE'] = int(os.environ.get('USER_CACHE_SIZE', 1024))
+app.config['USER_CACHE_TTL'] = float(os.environ.get('USER_CACHE_TTL', 60))
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 6))
+app.config['COMPRESS_CACHE_SIZE'] = int(os.environ.get('COMPRESS_CACHE_SIZE', 256))
+app.config['ANSWER_BATCH_MAX'] = int(os.environ.get('ANSWER_BATCH_MAX', 500))
+# Latencias mayores (una hora) se consideran datos corruptos del cliente
+app.config['ANSWER_MAX_LATENCY_MS'] = int(os.environ.get('ANSWER_MAX_LATENCY_MS', 3600000))
+app.config['FLASHCARD_PAGE_SIZE'] = int(os.environ.get('FLASHCARD_PAGE_SIZE', 20))
+app.config['FLASHCARD_PAGE_MAX'] = int(os.environ.get('FLASHCARD_PAGE_MAX', 100))
+app.config['FLASHCARD_STREAM_BATCH'] = int(os.environ.get('FLASHCARD_STREAM_BATCH', 500))
+app.config['REVIEW_MAX_LIMIT'] = int(os.environ.get('REVIEW_MAX_LIMIT', 50))
+app.config['REVIEW_RELEARN_MINUTES'] = int(os.environ.get('REVIEW_RELEARN_MINUTES', 10))
+# Antigüedad máxima que se acepta en el answered_at de una respuesta guardada sin conexión
+app.config['ANSWER_MAX_AGE_DAYS'] = int(os.environ.get('ANSWER_MAX_AGE_DAYS', 30))
+
+# Registro de respuestas con escritura diferida (write-behind). Ventana de
+# durabilidad: una respuesta aceptada puede tardar hasta
+# ANSWER_EVENT_FLUSH_INTERVAL segundos (o ANSWER_EVENT_BATCH_SIZE eventos) en
+# llegar a la base. Al apagar el worker se vacía la cola; si el proceso muere
+# de forma abrupta (SIGKILL, OOM) se pierden los eventos en memoria. Si el
+# buffer de ANSWER_EVENT_BUFFER eventos se llena, los nuevos se descartan y se
+# cuentan en /internal/stats. Los agregados de UserProgress no dependen de esta
+# cola: se guardan en la misma transacción que la petición.
+app.config['ANSWER_EVENT_BUFFER'] = int(os.environ.get('ANSWER_EVENT_BUFFER', 10000))
+app.config['ANSWER_EVENT_BATCH_SIZE'] = int(os.environ.get('ANSWER_EVENT_BATCH_SIZE', 500))
+app.config['ANSWER_EVENT_FLUSH_INTERVAL'] = float(os.environ.get('ANSWER_EVENT_FLUSH_INTERVAL', 2.0))
+
+# Perfil de SQLite para varios workers: WAL permite lectores concurrentes con
+# un escritor y busy_timeout hace esperar en lugar de fallar con "database is locked"
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),  # negativo = KiB
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),
+}
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+# Hash de contraseñas: se calcula en un pool acotado de hilos para que una ola
+# de logins no acapare todos los hilos del worker. PBKDF2 de hashlib libera el
+# GIL, así que las demás peticiones siguen atendiéndose mientras tanto.
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 30))
+
+password_executor = ThreadPoolExecutor(
+    max_workers=app.config['PASSWORD_HASH_WORKERS'],
+    thread_name_prefix='password-hash'
+)
+
+@functools.lru_cache(maxsize=None)
+def password_hash_prefix(method):
+    # Prefijo que Werkzeug guarda para el método (p. ej. "pbkdf2:sha256:600000")
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+def hash_password(password):
+    future = password_executor.submit(generate_password_hash, password, method=app.config['PASSWORD_HASH_METHOD'])
+    return future.result(timeout=app.config['PASSWORD_HASH_TIMEOUT'])
+
+def verify_password(password_hash, password):
+    future = password_executor.submit(check_password_hash, password_hash, password)
+    return future.result(timeout=app.config['PASSWORD_HASH_TIMEOUT'])
 
 # Inicializar extensiones
 db = SQLAlchemy(app)
@@ -1261,6 +532,14 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+@login_manager.unauthorized_handler
+def unauthorized():
+    # Las llamadas de la API (fetch) reciben 401 en JSON: si se las redirige a
+    # /login, fetch sigue la redirección y el cliente ve un 200 con HTML
+    if request.path.startswith('/api/') or request.is_json:
+        return jsonify({'error': 'Sesión no iniciada'}), 401
+    return redirect(url_for('login'))
+
 # Modelos
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -1271,10 +550,14 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def needs_rehash(self):
+        # Hashes creados con otro algoritmo o coste (p. ej. 'sha256' de init_db.py)
+        return self.password_hash.split('$', 1)[0] != password_hash_prefix(app.config['PASSWORD_HASH_METHOD'])
 
 class UserProgress(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -1283,10 +566,15 @@ class UserProgress(db.Model):
     score = db.Column(db.Integer, default=0)
     percentage = db.Column(db.Float, default=0.0)
     completed_cards = db.Column(db.Integer, default=0)
-    total_cards = db.Column(db.Integer, default=3)
+    total_cards = db.Column(db.Integer, default=0)
     completed = db.Column(db.Boolean, default=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Un único registro por usuario y categoría; permite el upsert atómico
+    __table_args__ = (
+        db.Index('ix_user_progress_user_category', 'user_id', 'category', unique=True),
+    )
+
     def __init__(self, user_id, category, score=0, percentage=0.0, completed_cards=0, completed=False):
         self.user_id = user_id
         self.category = category
@@ -1296,19 +584,655 @@ class UserProgress(db.Model):
         self.completed = completed
         self.updated_at = datetime.utcnow()
 
+class ProgressRollup(db.Model):
+    # Resumen por usuario y categoría que se mantiene en la misma transacción que
+    # cada escritura de progreso; las páginas leen O(categorías) filas
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    best_score = db.Column(db.Integer, nullable=False, default=0)
+    best_percentage = db.Column(db.Float, nullable=False, default=0.0)
+    completed_cards = db.Column(db.Integer, nullable=False, default=0)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_activity = db.Column(db.DateTime)
+
+class Category(db.Model):
+    key = db.Column(db.String(50), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    icon = db.Column(db.String(20))
+    color = db.Column(db.String(20))
+    description = db.Column(db.String(300))
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+
 class Flashcard(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(50), nullable=False)
     question = db.Column(db.String(500), nullable=False)
     image_url = db.Column(db.String(500))
-    options = db.Column(db.String(1000), nullable=False)  # JSON string of options
+    options = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'), nullable=False)  # Lista de opciones
     correct_option = db.Column(db.Integer, nullable=False)
     feedback = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_flashcard_category_id', 'category', 'id'),
+    )
+
+class ImageAsset(db.Model):
+    # Copia local de cada imagen remota de las tarjetas, en el almacén por contenido
+    source_url = db.Column(db.String(500), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False)
+    ext = db.Column(db.String(10), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    # Datos de las variantes redimensionadas (ver build_variants en media.py)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    variants = db.Column(db.JSON)
+    placeholder = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CardReviewState(db.Model):
+    # Estado de repaso espaciado (SM-2) de cada tarjeta para cada usuario
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    card_id = db.Column(db.Integer, db.ForeignKey('flashcard.id'), primary_key=True)
+    category = db.Column(db.String(50), nullable=False)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)
+    interval_days = db.Column(db.Float, nullable=False, default=0.0)
+    ease = db.Column(db.Float, nullable=False, default=2.5)
+    due_at = db.Column(db.DateTime, nullable=False)
+    last_reviewed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_card_review_state_user_due', 'user_id', 'due_at'),
+        db.Index('ix_card_review_state_user_category_due', 'user_id', 'category', 'due_at'),
+    )
+
+# Clave del cursor de tarjetas nuevas cuando se repasan todas las categorías
+NEW_CARD_CURSOR_ALL = '*'
+
+class NewCardCursor(db.Model):
+    # Todas las tarjetas con id <= last_seen_id de la categoría (o de todas, con
+    # NEW_CARD_CURSOR_ALL) ya tienen estado de repaso para el usuario: la
+    # búsqueda de tarjetas nuevas empieza a partir de ahí
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    last_seen_id = db.Column(db.Integer, nullable=False, default=0)
+
+class ProcessedAnswer(db.Model):
+    # Claves de idempotencia de las respuestas ya aplicadas; un lote reenviado
+    # por el cliente no vuelve a sumar al progreso
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    idempotency_key = db.Column(db.String(64), nullable=False)
+    card_id = db.Column(db.Integer, db.ForeignKey('flashcard.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_processed_answer_user_key', 'user_id', 'idempotency_key', unique=True),
+    )
+
+class AnswerEvent(db.Model):
+    # Historial de solo inserción con una fila por respuesta
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    card_id = db.Column(db.Integer, db.ForeignKey('flashcard.id'), nullable=False)
+    option = db.Column(db.SmallInteger, nullable=False)
+    correct = db.Column(db.Boolean, nullable=False)
+    latency_ms = db.Column(db.Integer)
+    answered_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_answer_event_user_answered', 'user_id', 'answered_at'),
+    )
+
+class AnswerEventWriter:
+    # Cola acotada en memoria que un hilo vacía en lotes, por tamaño o por tiempo.
+    # Cada worker tiene la suya; el hilo se crea en el primer uso dentro del proceso.
+    def __init__(self, max_buffer, batch_size, flush_interval):
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._stopping = None
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Primer uso en este proceso (o tras un fork): cola e hilo nuevos
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.max_buffer)
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='answer-event-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, events):
+        self._ensure_started()
+        for event_row in events:
+            try:
+                self._queue.put_nowait(event_row)
+            except queue.Full:
+                self.dropped += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self):
+        deadline = time.monotonic() + self.flush_interval
+        batch = []
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        with app.app_context():
+            self._insert(batch)
+        self.flushes += 1
+
+    def _insert(self, rows):
+        # Si el lote falla se reintenta por mitades hasta aislar las filas
+        # problemáticas: el lote mezcla eventos de varios usuarios y una fila
+        # mala no debe llevarse por delante a las demás
+        try:
+            db.session.execute(insert(AnswerEvent), rows)
+            db.session.commit()
+            self.written += len(rows)
+        except Exception as e:
+            db.session.rollback()
+            # Con la base caída no tiene sentido partir el lote
+            if len(rows) == 1 or isinstance(e, (OperationalError, InterfaceError)):
+                self.failed += len(rows)
+                print(f"Error guardando {len(rows)} eventos de respuesta: {e}")
+                return
+            middle = len(rows) // 2
+            self._insert(rows[:middle])
+            self._insert(rows[middle:])
+
+    def flush(self):
+        # Vacía todo lo pendiente en el hilo actual
+        if self._queue is None or self._pid != os.getpid():
+            return
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self):
+        if self._stopping is None or self._pid != os.getpid():
+            return
+        self._stopping.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        return {
+            'pending': self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+            'max_buffer': self.max_buffer,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'flushes': self.flushes
+        }
+
+answer_writer = AnswerEventWriter(
+    app.config['ANSWER_EVENT_BUFFER'],
+    app.config['ANSWER_EVENT_BATCH_SIZE'],
+    app.config['ANSWER_EVENT_FLUSH_INTERVAL']
+)
+atexit.register(answer_writer.stop)
+
+# Caché de mazos de flashcards
+class DeckCache:
+    # Caché LRU por worker que guarda cada mazo ya serializado a JSON (bytes).
+    # Cada categoría tiene un contador de versión; al cambiar sus tarjetas se
+    # incrementa y la entrada anterior deja de ser válida. Las versiones solo
+    # se incrementan en este proceso: los cambios hechos desde otro worker o
+    # desde un script se ven como mucho tras DECK_CACHE_TTL segundos.
+    def __init__(self, max_size, max_pages, ttl):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Páginas (category, after, limit) ya serializadas, con la misma versión que su mazo
+        self._pages = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def version(self, category):
+        return self._versions.get(category, 0)
+
+    def bump(self, category):
+        with self._lock:
+            self._versions[category] = self._versions.get(category, 0) + 1
+            self._entries.pop(category, None)
+            for key in [key for key in self._pages if key[0] == category]:
+                del self._pages[key]
+
+    def _lookup(self, entries, key, category):
+        # Entrada (body, etag) vigente: misma versión y sin caducar
+        entry = entries.get(key)
+        if entry is None or entry[0] != self._versions.get(category, 0) or time.monotonic() >= entry[3]:
+            return None
+        entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def _store(self, entries, max_size, key, category, version, body, etag):
+        # Si el mazo cambió mientras se serializaba, no guardamos datos viejos
+        if version == self._versions.get(category, 0):
+            entries[key] = (version, body, etag, time.monotonic() + self.ttl)
+            entries.move_to_end(key)
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+
+    def get(self, category):
+        # Devuelve (body, etag) o None si no hay una entrada vigente
+        with self._lock:
+            return self._lookup(self._entries, category, category)
+
+    def put(self, category, version, body):
+        # El ETag se deriva del contenido, así coincide entre workers
+        etag = 'deck-' + hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            self._store(self._entries, self.max_size, category, category, version, body, etag)
+        return body, etag
+
+    def get_page(self, key):
+        with self._lock:
+            return self._lookup(self._pages, key, key[0])
+
+    def put_page(self, key, version, body):
+        etag = 'page-' + hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            self._store(self._pages, self.max_pages, key, key[0], version, body, etag)
+        return body, etag
+
+deck_cache = DeckCache(app.config['DECK_CACHE_SIZE'], app.config['DECK_PAGE_CACHE_SIZE'], app.config['DECK_CACHE_TTL'])
+
+def mark_decks_changed(db_session, categories):
+    # Las versiones se incrementan en el próximo commit de la sesión. Las
+    # escrituras masivas (que no disparan eventos del ORM) deben llamarla.
+    db_session.info.setdefault('changed_decks', set()).update(categories)
+
+def _mark_deck_changed(mapper, connection, target):
+    db_session = inspect(target).session
+    if db_session is None:
+        return
+    mark_decks_changed(db_session, [target.category, *(inspect(target).attrs.category.history.deleted or ())])
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Flashcard, _event_name, _mark_deck_changed)
+
+@event.listens_for(Flashcard, 'after_update')
+def _reset_new_card_cursors(mapper, connection, target):
+    # Una tarjeta que cambia de categoría puede quedar por debajo de los
+    # cursores de la nueva: se reinician y se recalculan en la próxima consulta
+    if inspect(target).attrs.category.history.deleted:
+        connection.execute(delete(NewCardCursor).where(NewCardCursor.category == target.category))
+
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_decks(db_session):
+    # Solo invalidamos tras el commit para no cachear datos sin confirmar
+    changed = db_session.info.pop('changed_decks', ())
+    for category in changed:
+        deck_cache.bump(category)
+    # El número de tarjetas por categoría también cambia con los mazos
+    if db_session.info.pop('categories_changed', False) or changed:
+        category_registry.invalidate()
+    if db_session.info.pop('images_changed', False):
+        image_map.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_decks(db_session):
+    db_session.info.pop('changed_decks', None)
+    db_session.info.pop('categories_changed', None)
+    db_session.info.pop('images_changed', None)
+
+# Registro de categorías
+class CategoryRegistry:
+    # Metadatos de las categorías y número de tarjetas de cada una, cargados con
+    # una sola consulta por worker. Se invalida al confirmar cambios de
+    # categorías o tarjetas en este worker; el TTL acota cuánto tarda en verse
+    # un cambio hecho desde otro worker.
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._categories = None
+        self._expires_at = 0.0
+        self._payload = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        rows = db.session.execute(
+            select(Category, func.count(Flashcard.id))
+            .outerjoin(Flashcard, Flashcard.category == Category.key)
+            .group_by(Category.key)
+            .order_by(Category.sort_order, Category.key)
+        ).all()
+        return OrderedDict(
+            (category.key, {
+                'key': category.key,
+                'name': category.name,
+                'icon': category.icon,
+                'color': category.color,
+                'description': category.description,
+                'card_count': card_count
+            })
+            for category, card_count in rows
+        )
+
+    def all(self):
+        with self._lock:
+            categories = self._categories
+            if categories is not None and time.monotonic() < self._expires_at:
+                return categories
+        categories = self._load()
+        with self._lock:
+            self._categories = categories
+            self._expires_at = time.monotonic() + self.ttl
+        return categories
+
+    def get(self, key):
+        return self.all().get(key)
+
+    def payload(self):
+        # JSON del registro y su ETag, serializado una vez por cada carga
+        categories = self.all()
+        with self._lock:
+            if self._payload is not None and self._payload[0] is categories:
+                return self._payload[1]
+        body = app.json.dumps(list(categories.values())).encode('utf-8')
+        cached = (body, 'categories-' + hashlib.sha256(body).hexdigest()[:32])
+        with self._lock:
+            self._payload = (categories, cached)
+        return cached
+
+    def card_count(self, key):
+        category = self.get(key)
+        return category['card_count'] if category else 0
+
+    def invalidate(self):
+        with self._lock:
+            self._categories = None
+
+category_registry = CategoryRegistry(app.config['CATEGORY_REGISTRY_TTL'])
+
+def _mark_categories_changed(mapper, connection, target):
+    db_session = inspect(target).session
+    if db_session is not None:
+        db_session.info['categories_changed'] = True
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Category, _event_name, _mark_categories_changed)
+
+# Imágenes locales
+media_store = MediaStore()
+
+def image_asset_fields(source_url, sha256, ext, width, height, variants, placeholder):
+    # Campos de imagen de una tarjeta: la copia local y, si ya se generaron las
+    # variantes, srcset en WebP y PNG, dimensiones y placeholder
+    fields = {'image_url': f'/media/{sha256}.{ext}'}
+    if variants:
+        for image_format, key in (('webp', 'image_srcset_webp'), ('png', 'image_srcset')):
+            fields[key] = ', '.join(
+                f"/media/{variant['name']} {variant['width']}w"
+                for variant in variants if variant['format'] == image_format
+            )
+        fields['image_width'] = width
+        fields['image_height'] = height
+        fields['image_placeholder'] = placeholder
+    return fields
+
+class ImageAssetMap:
+    # URL original -> campos de su copia en /media, cargado entero una vez por
+    # worker. Los mazos en caché ya llevan las URLs reescritas: la ingesta marca
+    # como cambiados los mazos afectados, y en despliegue se ejecuta antes de
+    # arrancar gunicorn.
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._urls = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        rows = db.session.execute(select(
+            ImageAsset.source_url, ImageAsset.sha256, ImageAsset.ext, ImageAsset.width,
+            ImageAsset.height, ImageAsset.variants, ImageAsset.placeholder
+        )).all()
+        return {row.source_url: image_asset_fields(*row) for row in rows}
+
+    def all(self):
+        with self._lock:
+            if self._urls is not None and time.monotonic() < self._expires_at:
+                return self._urls
+        urls = self._load()
+        with self._lock:
+            self._urls = urls
+            self._expires_at = time.monotonic() + self.ttl
+        return urls
+
+    def get(self, url):
+        if not url:
+            return None
+        return self.all().get(url)
+
+    def invalidate(self):
+        with self._lock:
+            self._urls = None
+
+image_map = ImageAssetMap(app.config['IMAGE_MAP_TTL'])
+
+def _mark_images_changed(mapper, connection, target):
+    db_session = inspect(target).session
+    if db_session is not None:
+        db_session.info['images_changed'] = True
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(ImageAsset, _event_name, _mark_images_changed)
+
+def ingest_card_images(fetcher, store=media_store):
+    # Importa al almacén local las imágenes de las tarjetas que aún no tienen
+    # copia (o cuya copia falta en disco). Devuelve (importadas, fallos).
+    cards_by_url = {}
+    for url, category in db.session.execute(
+        select(Flashcard.image_url, Flashcard.category).where(Flashcard.image_url.isnot(None))
+    ):
+        if url and not url.startswith('/media/'):
+            cards_by_url.setdefault(url, set()).add(category)
+
+    known = {asset.source_url: asset for asset in ImageAsset.query}
+    imported = 0
+    failed = []
+    changed_categories = set()
+    for url, categories in cards_by_url.items():
+        asset = known.get(url)
+        if asset is not None and store.exists(f'{asset.sha256}.{asset.ext}'):
+            continue
+        try:
+            data = fetcher(url)
+            sha256, ext = store.put(data)
+        except (OSError, ValueError) as e:
+            failed.append((url, str(e)))
+            continue
+        db.session.merge(ImageAsset(source_url=url, sha256=sha256, ext=ext, size=len(data)))
+        changed_categories.update(categories)
+        imported += 1
+
+    mark_decks_changed(db.session, changed_categories)
+    db.session.commit()
+    return imported, failed
+
+def build_image_variants(force=False, workers=None, store=media_store):
+    # Genera las variantes de las imágenes importadas que aún no las tienen (o
+    # cuyos archivos faltan en disco). Devuelve (procesadas, fallos).
+    pending = {}
+    for asset in ImageAsset.query:
+        if asset.ext == 'svg':
+            continue
+        if force or not asset.variants or not all(store.exists(v['name']) for v in asset.variants):
+            pending[f'{asset.sha256}.{asset.ext}'] = asset
+
+    results, failed = build_all_variants(store.root, list(pending), workers)
+    for name, result in results.items():
+        asset = pending[name]
+        asset.width = result['width']
+        asset.height = result['height']
+        asset.variants = result['variants']
+        asset.placeholder = result['placeholder']
+
+    if results:
+        source_urls = [pending[name].source_url for name in results]
+        mark_decks_changed(db.session, db.session.execute(
+            select(Flashcard.category).where(Flashcard.image_url.in_(source_urls)).distinct()
+        ).scalars())
+    db.session.commit()
+    return len(results), failed
+
+def card_to_dict(card):
+    data = {
+        'id': card.id,
+        'question': card.question,
+        'image_url': card.image_url,
+        'options': card.options,
+        'correct_option': card.correct_option,
+        'feedback': card.feedback
+    }
+    image = image_map.get(card.image_url)
+    if image is not None:
+        data.update(image)
+    return data
+
+def serialize_deck(cards):
+    return app.json.dumps([card_to_dict(card) for card in cards]).encode('utf-8')
+
+def get_cached_deck(category):
+    # Devuelve (body, etag) del mazo completo, o None si la categoría no tiene tarjetas
+    cached = deck_cache.get(category)
+    if cached is None:
+        version = deck_cache.version(category)
+        cards = Flashcard.query.filter_by(category=category).order_by(Flashcard.id).all()
+        if not cards:
+            return None
+        cached = deck_cache.put(category, version, serialize_deck(cards))
+    return cached
+
+def warm_deck_cache():
+    # Carga todos los mazos con una sola consulta al arrancar el worker
+    try:
+        decks = {}
+        for card in Flashcard.query.order_by(Flashcard.category, Flashcard.id):
+            decks.setdefault(card.category, []).append(card)
+        for category, cards in list(decks.items())[:deck_cache.max_size]:
+            deck_cache.put(category, deck_cache.version(category), serialize_deck(cards))
+        print(f"Mazos de flashcards en caché: {min(len(decks), deck_cache.max_size)}")
+    except Exception as e:
+        print(f"Error al precargar los mazos: {e}")
+
+def get_pool_stats():
+    pool = db.engine.pool
+    stats = {'pid': os.getpid(), 'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow(),
+        })
+    with pool_wait_lock:
+        stats.update(pool_wait_stats)
+    stats['avg_wait_ms'] = round(stats['total_wait_ms'] / stats['waits'], 3) if stats['waits'] else 0.0
+    return stats
+
+# Caché del user_loader
+class UserSnapshot(UserMixin):
+    # Copia ligera y de solo lectura del usuario para current_user; no está
+    # ligada a la sesión de SQLAlchemy, así que puede compartirse entre peticiones
+    def __init__(self, user):
+        self.id = user.id
+        self.name = user.name
+        self.email = user.email
+        self.profile_photo = user.profile_photo
+
+class TTLCache:
+    # LRU acotada con caducidad por entrada y contadores de aciertos/fallos.
+    # Es por worker: los cambios hechos en otro worker se ven al caducar la entrada.
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
+
+user_cache = TTLCache(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = UserSnapshot(user)
+        user_cache.put(user_id, snapshot)
+    return snapshot
 
 # Rutas de autenticación
 @app.route('/register', methods=['POST'])
@@ -1330,6 +1254,7 @@ def register():
         
         db.session.add(new_user)
         db.session.commit()
+        user_cache.invalidate(new_user.id)
         
         return jsonify({'message': 'Usuario registrado exitosamente'}), 201
         
@@ -1342,7 +1267,7 @@ def login():
     if request.method == 'GET':
         if current_user.is_authenticated:
             return redirect(url_for('dashboard'))
-        return render_template_string(HTML_TEMPLATE)
+        return render_template('home.html')
         
     try:
         data = request.get_json() if request.is_json else request.form.to_dict()
@@ -1357,6 +1282,15 @@ def login():
             
         if not user.check_password(data['password']):
             return jsonify({'error': 'Contraseña incorrecta'}), 401
+
+        if user.needs_rehash():
+            # Actualizamos el hash a los parámetros actuales aprovechando la contraseña en claro
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error al actualizar el hash de la contraseña: {e}")
             
         login_user(user)
         return jsonify({'message': 'Login exitoso', 'redirect': url_for('dashboard')}), 200
@@ -1370,6 +1304,386 @@ def logout():
     logout_user()
     return redirect(url_for('home'))
 
+def upsert_progress(user_id, category, score, percentage, completed_cards, completed, total_cards=0):
+    # Guarda el progreso con una sola sentencia INSERT ... ON CONFLICT DO UPDATE,
+    # conservando el mejor score y porcentaje aunque varios workers escriban a la vez.
+    # El resumen (ProgressRollup) se actualiza en la misma transacción.
+    bind_dialect = db.session.get_bind().dialect
+    dialect = bind_dialect.name
+    now = datetime.utcnow()
+
+    if not bind_dialect.insert_returning:
+        # RETURNING necesita SQLite >= 3.35; con versiones anteriores, el camino del ORM
+        return _upsert_progress_orm(user_id, category, score, percentage, completed_cards, completed, total_cards)
+    if dialect == 'postgresql':
+        insert_fn, greatest = postgresql.insert, func.greatest
+    elif dialect == 'sqlite':
+        # En SQLite max() con varios argumentos es el equivalente escalar de GREATEST
+        insert_fn, greatest = sqlite.insert, func.max
+    else:
+        return _upsert_progress_orm(user_id, category, score, percentage, completed_cards, completed, total_cards)
+
+    stmt = insert_fn(UserProgress).values(
+        user_id=user_id,
+        category=category,
+        score=score,
+        percentage=percentage,
+        completed_cards=completed_cards,
+        total_cards=total_cards,
+        completed=completed,
+        updated_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserProgress.user_id, UserProgress.category],
+        set_={
+            'score': greatest(func.coalesce(UserProgress.score, 0), stmt.excluded.score),
+            'percentage': greatest(func.coalesce(UserProgress.percentage, 0.0), stmt.excluded.percentage),
+            'completed_cards': stmt.excluded.completed_cards,
+            'total_cards': stmt.excluded.total_cards,
+            # Como score y percentage, 'completed' es histórico: "completada alguna vez"
+            'completed': or_(func.coalesce(UserProgress.completed, False), stmt.excluded.completed),
+            'updated_at': stmt.excluded.updated_at
+        }
+    ).returning(
+        UserProgress.score,
+        UserProgress.percentage,
+        UserProgress.completed_cards,
+        UserProgress.completed
+    )
+    result = dict(db.session.execute(stmt).one()._mapping)
+
+    rollup = insert_fn(ProgressRollup).values(
+        user_id=user_id,
+        category=category,
+        best_score=score,
+        best_percentage=percentage,
+        completed_cards=completed_cards,
+        completed_count=int(completed),
+        attempts=1,
+        last_activity=now
+    )
+    rollup = rollup.on_conflict_do_update(
+        index_elements=[ProgressRollup.user_id, ProgressRollup.category],
+        set_={
+            'best_score': greatest(ProgressRollup.best_score, rollup.excluded.best_score),
+            'best_percentage': greatest(ProgressRollup.best_percentage, rollup.excluded.best_percentage),
+            'completed_cards': rollup.excluded.completed_cards,
+            'completed_count': ProgressRollup.completed_count + rollup.excluded.completed_count,
+            'attempts': ProgressRollup.attempts + 1,
+            'last_activity': rollup.excluded.last_activity
+        }
+    )
+    db.session.execute(rollup)
+    return result
+
+def _upsert_progress_orm(user_id, category, score, percentage, completed_cards, completed, total_cards=0):
+    # Camino genérico para motores sin ON CONFLICT
+    now = datetime.utcnow()
+    progress = UserProgress.query.filter_by(user_id=user_id, category=category).first()
+    if not progress:
+        progress = UserProgress(user_id=user_id, category=category)
+        db.session.add(progress)
+
+    progress.score = max(progress.score or 0, score)
+    progress.percentage = max(progress.percentage or 0.0, percentage)
+    progress.completed_cards = completed_cards
+    progress.total_cards = total_cards
+    progress.completed = bool(progress.completed) or completed
+    progress.updated_at = now
+
+    rollup = db.session.get(ProgressRollup, (user_id, category))
+    if not rollup:
+        rollup = ProgressRollup(user_id=user_id, category=category, best_score=0, best_percentage=0.0,
+                                completed_count=0, attempts=0)
+        db.session.add(rollup)
+    rollup.best_score = max(rollup.best_score, score)
+    rollup.best_percentage = max(rollup.best_percentage, percentage)
+    rollup.completed_cards = completed_cards
+    rollup.completed_count += int(completed)
+    rollup.attempts += 1
+    rollup.last_activity = now
+
+    db.session.flush()
+    return {
+        'score': progress.score,
+        'percentage': progress.percentage,
+        'completed_cards': progress.completed_cards,
+        'completed': progress.completed
+    }
+
+def migrate_user_progress_unique():
+    # Consolida los registros duplicados (user_id, category) que pudo dejar la
+    # versión anterior y crea el índice único si la tabla ya existía sin él.
+    duplicates = db.session.execute(
+        select(
+            UserProgress.user_id,
+            UserProgress.category,
+            func.min(UserProgress.id).label('keep_id'),
+            func.max(UserProgress.score).label('score'),
+            func.max(UserProgress.percentage).label('percentage'),
+            func.max(UserProgress.completed_cards).label('completed_cards'),
+            func.max(UserProgress.completed.cast(Integer)).label('completed'),
+            func.max(UserProgress.updated_at).label('updated_at')
+        )
+        .group_by(UserProgress.user_id, UserProgress.category)
+        .having(func.count(UserProgress.id) > 1)
+    ).all()
+
+    for row in duplicates:
+        UserProgress.query.filter(
+            UserProgress.user_id == row.user_id,
+            UserProgress.category == row.category,
+            UserProgress.id != row.keep_id
+        ).delete(synchronize_session=False)
+        UserProgress.query.filter_by(id=row.keep_id).update({
+            'score': row.score,
+            'percentage': row.percentage,
+            'completed_cards': row.completed_cards,
+            'completed': bool(row.completed),
+            'updated_at': row.updated_at
+        }, synchronize_session=False)
+
+    if duplicates:
+        print(f"Registros de progreso duplicados consolidados: {len(duplicates)}")
+    db.session.commit()
+
+    for index in UserProgress.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+
+def get_progress_summary(user_id):
+    # Resumen del progreso de todas las categorías leyendo el rollup por clave primaria
+    rows = db.session.execute(
+        select(ProgressRollup).where(ProgressRollup.user_id == user_id)
+    ).scalars()
+
+    return {
+        row.category: {
+            'best_score': row.best_score,
+            'best_percentage': row.best_percentage,
+            'completed_cards': row.completed_cards,
+            'completed_count': row.completed_count,
+            'completed': row.completed_count > 0,
+            'last_activity': row.last_activity
+        }
+        for row in rows
+    }
+
+def compute_progress_rollups(user_id=None):
+    # Recalcula los resúmenes desde UserProgress. Los contadores históricos
+    # (completed_count, attempts) solo pueden aproximarse: uno por registro.
+    query = select(
+        UserProgress.user_id,
+        UserProgress.category,
+        func.max(UserProgress.score).label('best_score'),
+        func.max(UserProgress.percentage).label('best_percentage'),
+        func.max(UserProgress.completed_cards).label('completed_cards'),
+        func.sum(UserProgress.completed.cast(Integer)).label('completed_count'),
+        func.count(UserProgress.id).label('attempts'),
+        func.max(UserProgress.updated_at).label('last_activity')
+    ).group_by(UserProgress.user_id, UserProgress.category)
+    if user_id is not None:
+        query = query.where(UserProgress.user_id == user_id)
+
+    return {
+        (row.user_id, row.category): {
+            'user_id': row.user_id,
+            'category': row.category,
+            'best_score': row.best_score or 0,
+            'best_percentage': row.best_percentage or 0.0,
+            'completed_cards': row.completed_cards or 0,
+            'completed_count': row.completed_count or 0,
+            'attempts': row.attempts,
+            'last_activity': row.last_activity
+        }
+        for row in db.session.execute(query)
+    }
+
+def rebuild_progress_rollups():
+    # Reescribe los campos que se derivan de UserProgress. Los contadores
+    # (attempts, completed_count) solo existen en el rollup, porque UserProgress
+    # tiene una fila por categoría: se conservan, y lo derivado solo sirve como
+    # mínimo o para crear las filas que faltan.
+    rollups = compute_progress_rollups()
+    existing = {(row.user_id, row.category): row for row in ProgressRollup.query}
+    missing = []
+    for key, wanted in rollups.items():
+        row = existing.get(key)
+        if row is None:
+            missing.append(wanted)
+            continue
+        row.best_score = wanted['best_score']
+        row.best_percentage = wanted['best_percentage']
+        row.completed_cards = wanted['completed_cards']
+        row.completed_count = max(row.completed_count, wanted['completed_count'])
+        row.attempts = max(row.attempts, wanted['attempts'])
+        if row.last_activity is None or (wanted['last_activity'] and wanted['last_activity'] > row.last_activity):
+            row.last_activity = wanted['last_activity']
+    if missing:
+        db.session.execute(insert(ProgressRollup), missing)
+    db.session.commit()
+    return len(rollups)
+
+def check_progress_rollups():
+    # Compara los campos derivables del rollup con UserProgress
+    expected = compute_progress_rollups()
+    actual = {(row.user_id, row.category): row for row in ProgressRollup.query}
+    problems = []
+    for key in expected.keys() | actual.keys():
+        if key not in actual:
+            problems.append((key, 'falta en el rollup'))
+            continue
+        if key not in expected:
+            problems.append((key, 'sin registros de progreso'))
+            continue
+        row, wanted = actual[key], expected[key]
+        for field in ('best_score', 'best_percentage', 'completed_cards'):
+            if getattr(row, field) != wanted[field]:
+                problems.append((key, f'{field}: {getattr(row, field)} != {wanted[field]}'))
+    return problems
+
+def migrate_progress_rollups():
+    # Backfill inicial: si la tabla de resúmenes está vacía pero hay progreso
+    if db.session.query(ProgressRollup.user_id).first() is None \
+            and db.session.query(UserProgress.id).first() is not None:
+        print(f"Resúmenes de progreso reconstruidos: {rebuild_progress_rollups()}")
+
+def create_missing_columns():
+    # create_all tampoco añade columnas nuevas; solo agregamos las que admiten NULL
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            quote = db.engine.dialect.identifier_preparer.quote
+            db.session.execute(text(f'ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}'))
+            print(f"Columna añadida: {table.name}.{column.name}")
+    db.session.commit()
+
+def create_missing_indexes():
+    # create_all no añade índices nuevos a tablas que ya existían
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+def migrate_flashcard_options_json():
+    # Convierte las opciones guardadas como str(list) de Python a JSON real y,
+    # en Postgres, cambia la columna a JSONB. Es idempotente.
+    is_postgres = db.engine.dialect.name == 'postgresql'
+    if is_postgres:
+        column_type = db.session.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'flashcard' AND column_name = 'options'"
+        )).scalar()
+        if column_type == 'jsonb':
+            return
+
+    converted = []
+    for row in db.session.execute(text('SELECT id, options FROM flashcard')):
+        if not isinstance(row.options, str):
+            continue
+        try:
+            json.loads(row.options)
+        except ValueError:
+            try:
+                options = ast.literal_eval(row.options)
+            except (ValueError, SyntaxError):
+                print(f"Opciones no convertibles en la flashcard {row.id}")
+                continue
+            converted.append({'id': row.id, 'options': json.dumps(options)})
+
+    if converted:
+        db.session.execute(text('UPDATE flashcard SET options = :options WHERE id = :id'), converted)
+        print(f"Flashcards convertidas a opciones JSON: {len(converted)}")
+    if is_postgres:
+        db.session.execute(text('ALTER TABLE flashcard ALTER COLUMN options TYPE JSONB USING options::jsonb'))
+    db.session.commit()
+
+# Respuestas condicionales (ETag / If-None-Match)
+def _matching_etag(etag):
+    # La compresión añade el sufijo de la codificación al ETag (ver compress_response)
+    for candidate in (etag, f'{etag}-br', f'{etag}-gzip'):
+        if request.if_none_match.contains(candidate):
+            return candidate
+    return None
+
+def is_not_modified(etag):
+    return _matching_etag(etag) is not None
+
+def not_modified_response(etag):
+    response = app.response_class(status=304)
+    response.set_etag(_matching_etag(etag) or etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def json_response_with_etag(body, etag):
+    response = body if isinstance(body, app.response_class) else app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+# Compresión de respuestas HTML y JSON
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/javascript', 'application/javascript', 'application/json'}
+
+# Cuerpos comprimidos por hash del contenido: las respuestas idénticas (login,
+# mazos en caché) no se vuelven a comprimir en cada petición
+compressed_cache = TTLCache(app.config['COMPRESS_CACHE_SIZE'], ttl=3600)
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def _compress(body, encoding):
+    key = (hashlib.sha1(body).digest(), encoding)
+    compressed = compressed_cache.get(key)
+    if compressed is None:
+        if encoding == 'br':
+            compressed = brotli.compress(body, quality=min(app.config['COMPRESS_LEVEL'], 11))
+        else:
+            compressed = gzip.compress(body, compresslevel=app.config['COMPRESS_LEVEL'], mtime=0)
+        compressed_cache.put(key, compressed)
+    return compressed
+
+@app.after_request
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    response.set_data(_compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
+
+def get_progress_etag(user_id):
+    # Versión del progreso del usuario: consulta barata sobre el índice (user_id, category)
+    row = db.session.execute(
+        select(func.count(UserProgress.id), func.max(UserProgress.updated_at))
+        .where(UserProgress.user_id == user_id)
+    ).one()
+    count, last_update = row
+    stamp = last_update.strftime('%Y%m%d%H%M%S%f') if last_update else '0'
+    return f'progress-{user_id}-{count}-{stamp}'
+
 @app.route('/save-progress', methods=['POST'])
 @login_required
 def save_progress():
@@ -1379,36 +1693,29 @@ def save_progress():
         if not all(k in data for k in ['category', 'score', 'percentage']):
             return jsonify({'error': 'Faltan datos requeridos'}), 400
 
-        # Buscar progreso existente
-        progress = UserProgress.query.filter_by(
-            user_id=current_user.id,
-            category=data['category']
-        ).first()
-
-        if not progress:
-            # Crear nuevo registro si no existe
-            progress = UserProgress(
-                user_id=current_user.id,
-                category=data['category']
-            )
-            db.session.add(progress)
-
-        # Actualizar el progreso
-        progress.score = max(progress.score, int(data['score']))
-        progress.percentage = round(max(progress.percentage, float(data['percentage'])), 1)  # Redondeamos a 1 decimal
-        progress.completed_cards = int((float(data['percentage']) / 100) * 3)  # 3 cards per category
-        progress.completed = data.get('completed', False)
-        progress.updated_at = datetime.utcnow()
+        category = category_registry.get(data['category'])
+        if category is None:
+            return jsonify({'error': 'Categoría no válida'}), 400
 
+        percentage = round(float(data['percentage']), 1)  # Redondeamos a 1 decimal
+        progress = upsert_progress(
+            user_id=current_user.id,
+            category=category['key'],
+            score=int(data['score']),
+            percentage=percentage,
+            completed_cards=int((percentage / 100) * category['card_count']),
+            completed=bool(data.get('completed', False)),
+            total_cards=category['card_count']
+        )
         db.session.commit()
 
         return jsonify({
             'message': 'Progreso guardado exitosamente',
             'progress': {
-                'score': progress.score,
-                'percentage': progress.percentage,
-                'completed_cards': progress.completed_cards,
-                'completed': progress.completed
+                'score': progress['score'],
+                'percentage': progress['percentage'],
+                'completed_cards': progress['completed_cards'],
+                'completed': progress['completed']
             }
         }), 200
 
@@ -1417,79 +1724,394 @@ def save_progress():
         print(f"Error saving progress: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def parse_client_time(value, now):
+    # Fecha ISO 8601 del cliente a UTC sin zona, acotada a
+    # [now - ANSWER_MAX_AGE_DAYS, now]: un reloj adelantado no programa repasos
+    # en el futuro. Sin fecha se usa la hora actual; si no es válida, ValueError.
+    if value is None:
+        return now
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    except OverflowError as e:
+        raise ValueError('fecha fuera de rango') from e
+    return min(max(parsed, now - timedelta(days=app.config['ANSWER_MAX_AGE_DAYS'])), now)
+
+def claim_idempotency_keys(user_id, answers):
+    # Registra las claves y devuelve solo las que no se habían procesado antes
+    bind_dialect = db.session.get_bind().dialect
+    dialect = bind_dialect.name
+    now = datetime.utcnow()
+    rows = [{
+        'user_id': user_id,
+        'idempotency_key': answer['idempotency_key'],
+        'card_id': answer['card_id'],
+        'created_at': now
+    } for answer in answers]
+
+    # RETURNING necesita SQLite >= 3.35; si no, se consultan antes las claves ya vistas
+    if dialect in ('postgresql', 'sqlite') and bind_dialect.insert_returning:
+        insert_fn = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert_fn(ProcessedAnswer).values(rows).on_conflict_do_nothing(
+            index_elements=[ProcessedAnswer.user_id, ProcessedAnswer.idempotency_key]
+        ).returning(ProcessedAnswer.idempotency_key)
+        return set(db.session.execute(stmt).scalars())
+
+    keys = [row['idempotency_key'] for row in rows]
+    seen = set(db.session.execute(
+        select(ProcessedAnswer.idempotency_key).where(
+            ProcessedAnswer.user_id == user_id,
+            ProcessedAnswer.idempotency_key.in_(keys)
+        )
+    ).scalars())
+    new_rows = [row for row in rows if row['idempotency_key'] not in seen]
+    if new_rows:
+        db.session.execute(insert(ProcessedAnswer), new_rows)
+    return {row['idempotency_key'] for row in new_rows}
+
+@app.route('/api/answers/batch', methods=['POST'])
+@login_required
+def save_answers_batch():
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Faltan datos requeridos'}), 400
+        answers = data.get('answers')
+
+        if not isinstance(answers, list) or not answers:
+            return jsonify({'error': 'Faltan datos requeridos'}), 400
+        if len(answers) > app.config['ANSWER_BATCH_MAX']:
+            return jsonify({'error': f"El lote supera el máximo de {app.config['ANSWER_BATCH_MAX']} respuestas"}), 400
+
+        # Validación de forma y duplicados dentro del mismo lote
+        now = datetime.utcnow()
+        valid, rejected, keys = [], [], set()
+        for index, answer in enumerate(answers):
+            try:
+                key = str(answer['idempotency_key'])
+                card_id = int(answer['card_id'])
+                option = answer['option']
+            except (KeyError, TypeError, ValueError):
+                rejected.append({'index': index, 'error': 'Respuesta incompleta'})
+                continue
+            if not key or len(key) > 64:
+                rejected.append({'index': index, 'error': 'Clave de idempotencia no válida'})
+                continue
+            # El rango de la opción se comprueba contra la tarjeta más abajo
+            if not isinstance(option, int) or isinstance(option, bool):
+                rejected.append({'idempotency_key': key, 'error': 'Opción no válida'})
+                continue
+            latency_ms = answer.get('latency_ms')
+            if latency_ms is not None and (
+                not isinstance(latency_ms, int) or isinstance(latency_ms, bool)
+                or not 0 <= latency_ms <= app.config['ANSWER_MAX_LATENCY_MS']
+            ):
+                rejected.append({'idempotency_key': key, 'error': 'Latencia no válida'})
+                continue
+            try:
+                answered_at = parse_client_time(answer.get('answered_at'), now)
+            except (TypeError, ValueError):
+                rejected.append({'idempotency_key': key, 'error': 'Fecha no válida'})
+                continue
+            if key in keys:
+                continue
+            keys.add(key)
+            valid.append({
+                'idempotency_key': key,
+                'card_id': card_id,
+                'option': option,
+                'answered_at': answered_at,
+                'latency_ms': latency_ms
+            })
+
+        # Una sola consulta para validar todas las tarjetas del lote
+        cards = {
+            row.id: row for row in db.session.execute(
+                select(Flashcard.id, Flashcard.category, Flashcard.correct_option, Flashcard.options)
+                .where(Flashcard.id.in_({answer['card_id'] for answer in valid}))
+            )
+        } if valid else {}
+        known = []
+        for answer in valid:
+            card = cards.get(answer['card_id'])
+            if card is None:
+                rejected.append({'idempotency_key': answer['idempotency_key'], 'error': 'Flashcard no encontrada'})
+            elif not 0 <= answer['option'] < len(card.options or ()):
+                rejected.append({'idempotency_key': answer['idempotency_key'], 'error': 'Opción no válida'})
+            else:
+                known.append(answer)
+
+        new_keys = claim_idempotency_keys(current_user.id, known) if known else set()
+
+        # Respuestas nuevas (las duplicadas ya se aplicaron en un envío anterior)
+        events = []
+        for answer in known:
+            if answer['idempotency_key'] not in new_keys:
+                continue
+            card = cards[answer['card_id']]
+            events.append({
+                'user_id': current_user.id,
+                'card_id': answer['card_id'],
+                'option': answer['option'],
+                'correct': answer['option'] == card.correct_option,
+                'latency_ms': answer['latency_ms'],
+                'answered_at': answer['answered_at']
+            })
+
+        progress = {}
+        if events:
+            first_seen = schedule_reviews(current_user.id, [
+                dict(event_row, category=cards[event_row['card_id']].category) for event_row in events
+            ])
+            # Un cuestionario puede llegar en varios envíos: el progreso se
+            # calcula con el estado de cada tarjeta, no solo con este lote
+            categories = {cards[event_row['card_id']].category for event_row in events}
+            for category, seen, correct in db.session.execute(
+                select(
+                    CardReviewState.category,
+                    func.count(),
+                    func.sum(case((CardReviewState.repetitions > 0, 1), else_=0))
+                )
+                .where(CardReviewState.user_id == current_user.id, CardReviewState.category.in_(categories))
+                .group_by(CardReviewState.category)
+            ):
+                total_cards = max(category_registry.card_count(category), seen)
+                seen_before = seen - sum(1 for card_id in first_seen if cards[card_id].category == category)
+                progress[category] = upsert_progress(
+                    user_id=current_user.id,
+                    category=category,
+                    score=correct,
+                    percentage=round(correct / total_cards * 100, 1),
+                    completed_cards=seen,
+                    # Solo el envío que ve la última tarjeta cuenta como una compleción
+                    completed=seen_before < total_cards <= seen,
+                    total_cards=total_cards
+                )
+
+        db.session.commit()
+        # El historial se escribe en segundo plano, fuera del commit de la petición
+        answer_writer.enqueue(events)
+
+        return jsonify({
+            'accepted': len(new_keys),
+            'duplicates': len(known) - len(new_keys),
+            'rejected': rejected,
+            'progress': progress
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error saving answer batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Repaso espaciado (SM-2)
+def next_review_state(state, correct, latency_ms, reviewed_at):
+    # Calidad de la respuesta en la escala de SM-2: correcta y rápida = 5,
+    # correcta = 4, incorrecta = 1
+    if not correct:
+        quality = 1
+    elif latency_ms is not None and latency_ms < 5000:
+        quality = 5
+    else:
+        quality = 4
+
+    state.ease = max(1.3, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        # Se vuelve a aprender la tarjeta en la misma sesión
+        state.repetitions = 0
+        state.interval_days = 0.0
+        state.due_at = reviewed_at + timedelta(minutes=app.config['REVIEW_RELEARN_MINUTES'])
+    else:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval_days = 1.0
+        elif state.repetitions == 2:
+            state.interval_days = 6.0
+        else:
+            state.interval_days = round(state.interval_days * state.ease, 2)
+        state.due_at = reviewed_at + timedelta(days=state.interval_days)
+    state.last_reviewed_at = reviewed_at
+    return state
+
+def schedule_reviews(user_id, reviews):
+    # reviews: dicts con card_id, category, correct, latency_ms y answered_at.
+    # Carga todos los estados afectados con una consulta y los actualiza en la
+    # transacción de la petición. Devuelve los ids de las tarjetas vistas por
+    # primera vez.
+    states = {
+        state.card_id: state for state in CardReviewState.query.filter(
+            CardReviewState.user_id == user_id,
+            CardReviewState.card_id.in_({review['card_id'] for review in reviews})
+        )
+    }
+    first_seen = set()
+    for review in sorted(reviews, key=lambda review: review['answered_at']):
+        state = states.get(review['card_id'])
+        if state is None:
+            first_seen.add(review['card_id'])
+            state = CardReviewState(
+                user_id=user_id,
+                card_id=review['card_id'],
+                category=review['category'],
+                repetitions=0,
+                interval_days=0.0,
+                ease=2.5
+            )
+            db.session.add(state)
+            states[review['card_id']] = state
+        next_review_state(state, review['correct'], review['latency_ms'], review['answered_at'])
+    return first_seen
+
+def due_cards_query(user_id, now, limit, category=None):
+    # Un solo recorrido por rango del índice (user_id[, category], due_at)
+    query = (
+        select(Flashcard, CardReviewState.due_at)
+        .join(CardReviewState, CardReviewState.card_id == Flashcard.id)
+        .where(CardReviewState.user_id == user_id, CardReviewState.due_at <= now)
+    )
+    if category is not None:
+        query = query.where(CardReviewState.category == category)
+    return query.order_by(CardReviewState.due_at).limit(limit)
+
+def new_cards_query(user_id, limit, category=None, after=0):
+    # Tarjetas que el usuario aún no ha visto, en orden de la baraja
+    seen = select(CardReviewState.card_id).where(
+        CardReviewState.user_id == user_id,
+        CardReviewState.card_id == Flashcard.id
+    ).exists()
+    query = select(Flashcard).where(Flashcard.id > after, ~seen)
+    if category is not None:
+        query = query.where(Flashcard.category == category)
+    return query.order_by(Flashcard.id).limit(limit)
+
+def last_seen_card_query(user_id, category=None):
+    # La tarjeta vista de mayor id, recorriendo la baraja desde el final
+    seen = select(CardReviewState.card_id).where(
+        CardReviewState.user_id == user_id,
+        CardReviewState.card_id == Flashcard.id
+    ).exists()
+    query = select(Flashcard.id).where(seen)
+    if category is not None:
+        query = query.where(Flashcard.category == category)
+    return query.order_by(Flashcard.id.desc()).limit(1)
+
+def pick_new_cards(db_session, user_id, limit, category=None):
+    # Tarjetas nuevas a partir del cursor del usuario. Sin cursor, el anti-join
+    # recorre todas las tarjetas ya vistas antes de encontrar una nueva. El
+    # cursor avanza hasta justo antes de la primera tarjeta sin ver (o hasta la
+    # última vista si no queda ninguna); el llamador hace el commit.
+    key = category or NEW_CARD_CURSOR_ALL
+    cursor = db_session.get(NewCardCursor, (user_id, key))
+    after = cursor.last_seen_id if cursor is not None else 0
+    cards = db_session.execute(new_cards_query(user_id, limit, category, after)).scalars().all()
+    if cards:
+        position = cards[0].id - 1
+    else:
+        position = db_session.scalar(last_seen_card_query(user_id, category)) or 0
+    if position > after:
+        if cursor is None:
+            db_session.add(NewCardCursor(user_id=user_id, category=key, last_seen_id=position))
+        else:
+            cursor.last_seen_id = position
+    return cards
+
+@app.route('/api/review/due')
+@login_required
+def get_due_cards():
+    try:
+        category = request.args.get('category') or None
+        limit = min(max(request.args.get('limit', 10, type=int), 1), app.config['REVIEW_MAX_LIMIT'])
+        now = datetime.utcnow()
+
+        cards = [
+            dict(card_to_dict(card), due_at=due_at.isoformat() + 'Z', new=False)
+            for card, due_at in db.session.execute(due_cards_query(current_user.id, now, limit, category))
+        ]
+        if len(cards) < limit:
+            cards.extend(
+                dict(card_to_dict(card), due_at=None, new=True)
+                for card in pick_new_cards(db.session, current_user.id, limit - len(cards), category)
+            )
+            if db.session.new or db.session.dirty:
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # Otra petición del mismo usuario creó el cursor a la vez
+                    db.session.rollback()
+
+        return jsonify({'cards': cards})
+    except Exception as e:
+        print(f"Error getting due cards: {e}")
+        return jsonify({'error': 'Error al obtener las tarjetas para repasar'}), 500
+
 @app.route('/get-progress/<category>')
 @login_required
 def get_progress(category):
     try:
+        etag = f'{get_progress_etag(current_user.id)}-{category}'
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
         progress = UserProgress.query.filter_by(
             user_id=current_user.id,
             category=category
         ).order_by(UserProgress.updated_at.desc()).first()
         
         if progress:
-            return jsonify({
+            return json_response_with_etag(jsonify({
                 'score': progress.score,
                 'percentage': progress.percentage,
                 'completed': progress.completed
-            })
-        return jsonify({
+            }), etag)
+        return json_response_with_etag(jsonify({
             'score': 0,
             'percentage': 0,
             'completed': False
-        })
+        }), etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Estadísticas internas del worker; solo disponibles si se define INTERNAL_STATS_TOKEN
+@app.route('/internal/stats')
+def internal_stats():
+    token = os.environ.get('INTERNAL_STATS_TOKEN')
+    if not token or request.headers.get('X-Internal-Token') != token:
+        return jsonify({'error': 'No encontrado'}), 404
+    return jsonify({
+        'pool': get_pool_stats(),
+        'user_cache': user_cache.stats(),
+        'compressed_cache': compressed_cache.stats(),
+        'answer_events': answer_writer.stats()
+    })
+
 @app.route('/')
 def home():
-    return render_template_string(HTML_TEMPLATE)
+    return render_template('home.html')
 
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    categories = {
-        'emociones': {
-            'name': 'Desarrollo Emocional',
-            'icon': '😊',
-            'color': '#FF9800',
-            'description': 'Aprende sobre emociones y expresiones faciales'
-        },
-        'conceptos': {
-            'name': 'Conceptos Básicos',
-            'icon': '📚',
-            'color': '#4CAF50',
-            'description': 'Aprende formas, colores y números'
-        },
-        'entorno': {
-            'name': 'Conocimiento del Entorno',
-            'icon': '🌍',
-            'color': '#2196F3',
-            'description': 'Aprende sobre animales, clima y naturaleza'
-        }
-    }
-    
+    summary = get_progress_summary(current_user.id)
+
     study_fields = []
-    for key, category in categories.items():
-        # Obtener el progreso más reciente
-        progress = UserProgress.query.filter_by(
-            user_id=current_user.id,
-            category=key
-        ).first()
-        
+    for key, category in category_registry.all().items():
+        progress = summary.get(key)
+
         study_fields.append({
             'name': category['name'],
             'route': key,
             'icon': category['icon'],
             'color': category['color'],
             'description': category['description'],
-            'progress': progress.percentage if progress else 0,
-            'completed_cards': progress.completed_cards if progress else 0,
-            'total_cards': 3,  # Total de tarjetas por categoría
-            'completed': progress.completed if progress else False
+            'progress': progress['best_percentage'] if progress else 0,
+            'completed_cards': progress['completed_cards'] if progress else 0,
+            'total_cards': category['card_count'],
+            'completed': progress['completed'] if progress else False
         })
 
-    return render_template_string(
-        DASHBOARD_TEMPLATE,
+    return render_template(
+        'dashboard.html',
         study_fields=study_fields,
         current_user=current_user
     )
@@ -1497,13 +2119,13 @@ def dashboard():
 @app.route('/profile')
 @login_required
 def profile():
-    return render_template_string(PROFILE_TEMPLATE, current_user=current_user)
+    return render_template('profile.html', current_user=current_user)
 
 @app.route('/update-profile', methods=['POST'])
 @login_required
 def update_profile():
     try:
-        user = User.query.get(current_user.id)
+        user = db.session.get(User, current_user.id)
         
         user.name = request.form.get('name', user.name)
         user.email = request.form.get('email', user.email)
@@ -1513,6 +2135,7 @@ def update_profile():
             user.set_password(request.form.get('password'))
         
         db.session.commit()
+        user_cache.invalidate(user.id)
         return redirect(url_for('profile'))
     except Exception as e:
         db.session.rollback()
@@ -1521,105 +2144,148 @@ def update_profile():
 @app.route('/progress')
 @login_required
 def progress():
-    categories = {
-        'emociones': {
-            'name': 'Desarrollo Emocional',
-            'icon': '😊',
-            'color': '#FF9800'
-        },
-        'conceptos': {
-            'name': 'Conceptos Básicos',
-            'icon': '📚',
-            'color': '#4CAF50'
-        },
-        'entorno': {
-            'name': 'Conocimiento del Entorno',
-            'icon': '🌍',
-            'color': '#2196F3'
-        }
-    }
-    
+    try:
+        summary = get_progress_summary(current_user.id)
+    except Exception as e:
+        print(f"Error processing progress: {str(e)}")
+        db.session.rollback()
+        summary = {}
+
     progress_data = []
-    for category_key, category in categories.items():
-        try:
-            # Obtener todos los registros de progreso para esta categoría
-            progress_records = UserProgress.query.filter_by(
-                user_id=current_user.id,
-                category=category_key
-            ).order_by(UserProgress.updated_at.desc()).all()
-            
-            # Calcular estadísticas
-            completed_cards = len([p for p in progress_records if p.completed])
-            best_score = max([p.score for p in progress_records]) if progress_records else 0
-            last_activity = progress_records[0].updated_at.strftime('%d/%m/%Y') if progress_records else 'Sin actividad'
-            
-            # Calcular el progreso total basado en el mejor score
-            try:
-                total_progress = max([p.percentage for p in progress_records]) if progress_records else 0
-            except:
-                total_progress = (best_score / 3.0) * 100 if best_score > 0 else 0
-            
-            progress_data.append({
-                'name': category['name'],
-                'icon': category['icon'],
-                'color': category['color'],
-                'completed_cards': completed_cards,
-                'total_cards': 3,  # Total de tarjetas por categoría
-                'best_score': best_score,
-                'last_activity': last_activity,
-                'progress': total_progress
-            })
-        except Exception as e:
-            print(f"Error processing progress for {category_key}: {str(e)}")
-            # Agregar datos por defecto si hay error
-            progress_data.append({
-                'name': category['name'],
-                'icon': category['icon'],
-                'color': category['color'],
-                'completed_cards': 0,
-                'total_cards': 3,
-                'best_score': 0,
-                'last_activity': 'Sin actividad',
-                'progress': 0
-            })
+    for category_key, category in category_registry.all().items():
+        progress = summary.get(category_key)
+        last_activity = progress['last_activity'] if progress else None
+
+        progress_data.append({
+            'name': category['name'],
+            'icon': category['icon'],
+            'color': category['color'],
+            'completed_cards': progress['completed_cards'] if progress else 0,
+            'total_cards': category['card_count'],
+            'best_score': progress['best_score'] if progress else 0,
+            'last_activity': last_activity.strftime('%d/%m/%Y') if last_activity else 'Sin actividad',
+            'progress': progress['best_percentage'] if progress else 0
+        })
     
-    return render_template_string(PROGRESS_TEMPLATE, progress_data=progress_data, current_user=current_user)
+    return render_template('progress.html', progress_data=progress_data, current_user=current_user)
+
+def build_progress_data(user_id):
+    progress_data = {}
+    summary = get_progress_summary(user_id)
+    
+    for category in category_registry.all():
+        progress = summary.get(category)
+        
+        if progress:
+            progress_data[category] = {
+                'score': progress['best_score'],
+                'percentage': round(progress['best_percentage'], 1),  # Redondeamos a 1 decimal
+                'completed_cards': progress['completed_cards'],
+                'completed': progress['completed'],
+                'last_activity': progress['last_activity'].strftime('%d/%m/%Y')
+            }
+        else:
+            progress_data[category] = {
+                'score': 0,
+                'percentage': 0,
+                'completed_cards': 0,
+                'completed': False,
+                'last_activity': 'Sin actividad'
+            }
+    return progress_data
 
 @app.route('/get-all-progress')
 @login_required
 def get_all_progress():
     try:
-        progress_data = {}
-        categories = ['emociones', 'conceptos', 'entorno']
-        
-        for category in categories:
-            progress = UserProgress.query.filter_by(
-                user_id=current_user.id,
-                category=category
-            ).first()
-            
-            if progress:
-                progress_data[category] = {
-                    'score': progress.score,
-                    'percentage': round(progress.percentage, 1),  # Redondeamos a 1 decimal
-                    'completed_cards': progress.completed_cards,
-                    'completed': progress.completed,
-                    'last_activity': progress.updated_at.strftime('%d/%m/%Y')
-                }
-            else:
-                progress_data[category] = {
-                    'score': 0,
-                    'percentage': 0,
-                    'completed_cards': 0,
-                    'completed': False,
-                    'last_activity': 'Sin actividad'
-                }
-        
-        return jsonify(progress_data)
+        # La respuesta tiene una entrada por categoría: el ETag cubre también el registro
+        categories_etag = category_registry.payload()[1]
+        etag = f"{get_progress_etag(current_user.id)}-{categories_etag.rsplit('-', 1)[1][:12]}"
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        return json_response_with_etag(jsonify(build_progress_data(current_user.id)), etag)
     except Exception as e:
         print(f"Error getting progress: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/bootstrap')
+@login_required
+def bootstrap_session():
+    # Todo lo necesario para arrancar la app en una sola respuesta: registro de
+    # categorías, progreso del usuario y, con ?decks=all o ?decks=a,b, los
+    # mazos completos. Los mazos y el registro salen ya serializados de sus
+    # cachés y se concatenan tal cual.
+    try:
+        categories_body, categories_etag = category_registry.payload()
+        progress_etag = get_progress_etag(current_user.id)
+
+        requested = request.args.get('decks', '')
+        if requested == 'all':
+            deck_keys = list(category_registry.all())
+        else:
+            deck_keys = [key for key in requested.split(',') if category_registry.get(key) is not None]
+        decks = []
+        for key in dict.fromkeys(deck_keys):
+            cached = get_cached_deck(key)
+            if cached is not None:
+                decks.append((key, cached))
+
+        # El ETag combinado cambia si cambia cualquiera de las piezas
+        parts = [categories_etag, progress_etag] + [f'{key}:{etag}' for key, (body, etag) in decks]
+        etag = 'bootstrap-' + hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        progress_body = app.json.dumps(build_progress_data(current_user.id)).encode('utf-8')
+        deck_bodies = b','.join(app.json.dumps(key).encode('utf-8') + b':' + body for key, (body, _) in decks)
+        body = (
+            b'{"categories":' + categories_body
+            + b',"progress":' + progress_body
+            + b',"decks":{' + deck_bodies + b'}}'
+        )
+        return json_response_with_etag(body, etag)
+    except Exception as e:
+        print(f"Error en bootstrap: {e}")
+        return jsonify({'error': 'Error al cargar los datos iniciales'}), 500
+
+DEFAULT_CATEGORIES = [
+    {
+        'key': 'emociones',
+        'name': 'Desarrollo Emocional',
+        'icon': '😊',
+        'color': '#FF9800',
+        'description': 'Aprende sobre emociones y expresiones faciales'
+    },
+    {
+        'key': 'conceptos',
+        'name': 'Conceptos Básicos',
+        'icon': '📚',
+        'color': '#4CAF50',
+        'description': 'Aprende formas, colores y números'
+    },
+    {
+        'key': 'entorno',
+        'name': 'Conocimiento del Entorno',
+        'icon': '🌍',
+        'color': '#2196F3',
+        'description': 'Aprende sobre animales, clima y naturaleza'
+    }
+]
+
+def init_categories():
+    existing = set(db.session.execute(select(Category.key)).scalars())
+    new_categories = [
+        dict(category, sort_order=position)
+        for position, category in enumerate(DEFAULT_CATEGORIES)
+        if category['key'] not in existing
+    ]
+    if new_categories:
+        db.session.execute(insert(Category), new_categories)
+        db.session.info['categories_changed'] = True
+    db.session.commit()
+    print(f"Categorías nuevas: {len(new_categories)}")
+
 def init_flashcards():
     default_cards = {
         'emociones': [
@@ -1693,50 +2359,122 @@ def init_flashcards():
         ]
     }
 
-    for category, cards in default_cards.items():
-        for card in cards:
-            existing_card = Flashcard.query.filter_by(
-                category=category,
-                question=card['question']
-            ).first()
-            
-            if not existing_card:
-                new_card = Flashcard(
-                    category=category,
-                    question=card['question'],
-                    image_url=card['image_url'],
-                    options=str(card['options']),
-                    correct_option=card['correct_option'],
-                    feedback=card['feedback']
-                )
-                db.session.add(new_card)
-    
+    # Una sola consulta para saber qué tarjetas existen y un INSERT masivo con las que faltan
+    existing = set(db.session.execute(
+        select(Flashcard.category, Flashcard.question)
+        .where(Flashcard.category.in_(list(default_cards)))
+    ).all())
+    now = datetime.utcnow()
+    new_cards = [
+        dict(card, category=category, created_at=now)
+        for category, cards in default_cards.items()
+        for card in cards
+        if (category, card['question']) not in existing
+    ]
+
     try:
+        if new_cards:
+            db.session.execute(insert(Flashcard), new_cards)
+            mark_decks_changed(db.session, {card['category'] for card in new_cards})
         db.session.commit()
+        print(f"Flashcards nuevas: {len(new_cards)}")
     except Exception as e:
         db.session.rollback()
         print(f"Error initializing flashcards: {e}")
 
+def deck_page_query(category, after, limit):
+    # Paginación por clave (keyset): recorre el índice (category, id) desde el
+    # cursor, sin OFFSET, así que cada página cuesta lo mismo sea cual sea
+    query = select(Flashcard).where(Flashcard.category == category)
+    if after is not None:
+        query = query.where(Flashcard.id > after)
+    return query.order_by(Flashcard.id).limit(limit)
+
+def flashcard_page_response(category, after, limit):
+    # Las páginas se cachean como los mazos: en caliente no hay ninguna consulta
+    key = (category, after, limit)
+    cached = deck_cache.get_page(key)
+    if cached is None:
+        version = deck_cache.version(category)
+        # Pedimos una tarjeta de más para saber si hay página siguiente
+        cards = db.session.execute(deck_page_query(category, after, limit + 1)).scalars().all()
+        next_cursor = cards[limit - 1].id if len(cards) > limit else None
+        body = app.json.dumps({
+            'cards': [card_to_dict(card) for card in cards[:limit]],
+            'next_cursor': next_cursor,
+            'total': category_registry.card_count(category)
+        }).encode('utf-8')
+        cached = deck_cache.put_page(key, version, body)
+
+    body, etag = cached
+    if is_not_modified(etag):
+        return not_modified_response(etag)
+    return json_response_with_etag(body, etag)
+
+def flashcard_stream_response(category):
+    # Una tarjeta JSON por línea, leída con un cursor del lado del servidor
+    # (stream_results en PostgreSQL) por lotes de FLASHCARD_STREAM_BATCH: la
+    # memoria no crece con el tamaño del mazo. La conexión queda ocupada
+    # mientras dura la descarga.
+    query = (
+        select(Flashcard)
+        .where(Flashcard.category == category)
+        .order_by(Flashcard.id)
+        .execution_options(yield_per=app.config['FLASHCARD_STREAM_BATCH'])
+    )
+
+    def generate():
+        for card in db.session.execute(query).scalars():
+            yield app.json.dumps(card_to_dict(card)) + '\n'
+
+    response = app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def wants_ndjson():
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
 @app.route('/api/flashcards/<category>')
 @login_required
 def get_flashcards(category):
     try:
-        cards = Flashcard.query.filter_by(category=category).all()
-        if not cards:
+        if wants_ndjson() or 'after' in request.args or 'limit' in request.args:
+            if category_registry.get(category) is None:
+                return jsonify({'error': 'No se encontraron flashcards para esta categoría'}), 404
+            if wants_ndjson():
+                return flashcard_stream_response(category)
+            limit = request.args.get('limit', app.config['FLASHCARD_PAGE_SIZE'], type=int)
+            limit = min(max(limit, 1), app.config['FLASHCARD_PAGE_MAX'])
+            return flashcard_page_response(category, request.args.get('after', type=int), limit)
+
+        # Sin parámetros se devuelve el mazo completo desde la caché
+        cached = get_cached_deck(category)
+        if cached is None:
             return jsonify({'error': 'No se encontraron flashcards para esta categoría'}), 404
-            
-        return jsonify([{
-            'id': card.id,
-            'question': card.question,
-            'image_url': card.image_url,
-            'options': eval(card.options),
-            'correct_option': card.correct_option,
-            'feedback': card.feedback
-        } for card in cards])
+
+        body, etag = cached
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        return json_response_with_etag(body, etag)
     except Exception as e:
         print(f"Error getting flashcards: {e}")
         return jsonify({'error': 'Error al obtener las flashcards'}), 500
 
+@app.route('/media/<name>')
+def media_file(name):
+    # El nombre es el hash del contenido: la respuesta no cambia nunca
+    if not MEDIA_NAME_RE.match(name):
+        abort(404)
+    response = send_from_directory(media_store.root, name, max_age=31536000)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    if name.endswith('.svg'):
+        # Un SVG puede llevar scripts: se sirve aislado de nuestro origen
+        response.headers['Content-Security-Policy'] = 'sandbox'
+    return response
+
 def init_db():
     print("Iniciando inicialización de la base de datos...")
     try:
@@ -1745,31 +2483,82 @@ def init_db():
         db.create_all()
         print("Tablas creadas correctamente")
         
-        # Verificar si necesitamos inicializar datos
-        user_count = User.query.count()
-        print(f"Número de usuarios existentes: {user_count}")
-        
-        if user_count == 0:
-            print("Inicializando flashcards...")
+        migrate_user_progress_unique()
+        migrate_flashcard_options_json()
+        migrate_progress_rollups()
+        create_missing_columns()
+        create_missing_indexes()
+
+        print("Inicializando flashcards...")
+        init_categories()
         init_flashcards()
-            print("Flashcards inicializadas correctamente")
+        print("Flashcards inicializadas correctamente")
         return True
     except Exception as e:
         print(f"Error al inicializar la base de datos: {e}")
         return False
 
-# Inicializar la base de datos al arrancar la aplicación
-with app.app_context():
-    print("Iniciando la aplicación - Configuración inicial de la base de datos...")
-    init_db()
+# La importación del módulo no toca la base de datos: el esquema, las
+# migraciones y los datos iniciales se aplican una vez por despliegue con
+# `flask --app app bootstrap` (ver render.yaml) y cada worker precarga los
+# mazos al arrancar (ver gunicorn.conf.py).
+@app.cli.command('bootstrap')
+def bootstrap_command():
+    """Crea las tablas, aplica las migraciones y carga las flashcards iniciales."""
+    if not init_db():
+        raise SystemExit(1)
+
+@app.cli.command('rebuild-rollups')
+@click.option('--check', is_flag=True, help='Solo compara el rollup con UserProgress, sin modificarlo.')
+def rebuild_rollups_command(check):
+    """Reconstruye (o verifica) los resúmenes de progreso por usuario y categoría."""
+    if check:
+        problems = check_progress_rollups()
+        for (user_id, category), problem in problems:
+            print(f"usuario {user_id} / {category}: {problem}")
+        print(f"Inconsistencias: {len(problems)}")
+        if problems:
+            raise SystemExit(1)
+        return
+    print(f"Resúmenes reconstruidos: {rebuild_progress_rollups()}")
+
+@app.cli.command('ingest-images')
+@click.option('--from-dir', type=click.Path(exists=True, file_okay=False),
+              help='Lee las imágenes de este directorio en lugar de descargarlas.')
+def ingest_images_command(from_dir):
+    """Copia las imágenes de las tarjetas al almacén local de /media."""
+    fetcher = directory_fetcher(from_dir) if from_dir else http_fetcher
+    imported, failed = ingest_card_images(fetcher)
+    for url, error in failed:
+        print(f"No se pudo importar {url}: {error}")
+    # Las imágenes que fallan se siguen sirviendo desde su URL original
+    print(f"Imágenes importadas: {imported}, fallidas: {len(failed)}")
+
+@app.cli.command('build-image-variants')
+@click.option('--force', is_flag=True, help='Regenera también las imágenes que ya tienen variantes.')
+@click.option('--workers', type=int, default=None, help='Procesos en paralelo (por defecto, uno por CPU).')
+def build_image_variants_command(force, workers):
+    """Genera las variantes WebP/PNG y los placeholders de las imágenes importadas."""
+    try:
+        processed, failed = build_image_variants(force=force, workers=workers)
+    except RuntimeError as e:
+        print(f"No se pueden generar las variantes: {e}")
+        raise SystemExit(1)
+    for name, error in failed:
+        print(f"No se pudo procesar {name}: {error}")
+    print(f"Imágenes procesadas: {processed}, fallidas: {len(failed)}")
 
 # Rutas para las categorías de aprendizaje
-@app.route('/emociones')
-@app.route('/conceptos')
-@app.route('/entorno')
+@app.route('/<category>')
 @login_required
-def learning_category():
-    return render_template_string(FLASHCARD_TEMPLATE)
+def learning_category(category):
+    if category_registry.get(category) is None:
+        abort(404)
+    return render_template('flashcards.html')
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    with app.app_context():
+        init_db()
+    # El recargador también reinicia al editar static/css o static/js, y al
+    # arrancar se regeneran los archivos con hash
+    app.run(debug=True, extra_files=list(source_files())) 
\ No newline at end of file
@@ -0,0 +1,126 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Pipeline de archivos estáticos: copia el CSS/JS de static/css y static/js a
+# static/dist con el hash del contenido en el nombre, para poder servirlos con
+# Cache-Control: immutable, y escribe un manifest que las plantillas usan
+# para resolver el nombre final de cada archivo. Junto a cada archivo se
+# guardan sus variantes .gz (y .br si está instalado brotli), que la
+# aplicación sirve según el Accept-Encoding.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+
+def minify_css(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    return source.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(source):
+    # Conservador: solo quita indentación, líneas vacías y comentarios de línea
+    # completa; conserva los saltos de línea para no depender de la inserción
+    # automática de punto y coma
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def build_assets(static_dir=STATIC_DIR, minify=False):
+    manifest = {}
+    for source_dir in SOURCE_DIRS:
+        source_path = os.path.join(static_dir, source_dir)
+        if not os.path.isdir(source_path):
+            continue
+        output_path = os.path.join(static_dir, DIST_DIR, source_dir)
+        os.makedirs(output_path, exist_ok=True)
+
+        for name in sorted(os.listdir(source_path)):
+            stem, ext = os.path.splitext(name)
+            with open(os.path.join(source_path, name), encoding='utf-8') as f:
+                content = f.read()
+            if minify and ext in MINIFIERS:
+                content = MINIFIERS[ext](content)
+
+            data = content.encode('utf-8')
+            hashed_name = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+            hashed_path = os.path.join(output_path, hashed_name)
+            if not os.path.exists(hashed_path):
+                _write_atomic(hashed_path, data)
+            _write_compressed(hashed_path, data)
+            manifest[f'{source_dir}/{name}'] = f'{DIST_DIR}/{source_dir}/{hashed_name}'
+
+    _write_atomic(
+        os.path.join(static_dir, DIST_DIR, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    )
+    return manifest
+
+
+def source_files(static_dir=STATIC_DIR):
+    for source_dir in SOURCE_DIRS:
+        source_path = os.path.join(static_dir, source_dir)
+        if os.path.isdir(source_path):
+            for name in sorted(os.listdir(source_path)):
+                yield os.path.join(source_path, name)
+
+
+def manifest_is_stale(static_dir=STATIC_DIR):
+    # True si falta el manifest o algún archivo fuente es más nuevo que él
+    try:
+        built_at = os.path.getmtime(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME))
+    except OSError:
+        return True
+    return any(os.path.getmtime(path) > built_at for path in source_files(static_dir))
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_compressed(path, data):
+    if not os.path.exists(path + '.gz'):
+        _write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None and not os.path.exists(path + '.br'):
+        _write_atomic(path + '.br', brotli.compress(data, quality=11))
+
+
+def _write_atomic(path, data):
+    # Varios workers pueden construir a la vez: escribimos y renombramos
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Genera los archivos estáticos con hash de contenido')
+    parser.add_argument('--minify', action='store_true', help='minifica CSS y JS')
+    args = parser.parse_args()
+
+    built = build_assets(minify=args.minify)
+    for source, target in sorted(built.items()):
+        print(f"{source} -> {target}")
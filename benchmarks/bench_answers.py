@@ -0,0 +1,74 @@
+# Benchmark de ingesta de respuestas: una petición por respuesta a
+# /save-progress frente a lotes en /api/answers/batch.
+#
+#   python benchmarks/bench_answers.py --answers 600 --batch-size 30
+#
+# Por defecto trabaja sobre una base SQLite temporal (--sqlite-path para usar otra).
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Respuestas/s por petición individual vs por lote')
+    parser.add_argument('--answers', type=int, default=600)
+    parser.add_argument('--batch-size', type=int, default=30)
+    parser.add_argument('--sqlite-path', help='base SQLite; por defecto una temporal')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-answers-') as workdir:
+        # El módulo lee la configuración del entorno al importarse
+        os.environ.pop('DATABASE_URL', None)
+        os.environ['SQLITE_PATH'] = args.sqlite_path or os.path.join(workdir, 'bench.db')
+        os.environ['TEMPLATE_CACHE_DIR'] = os.path.join(workdir, 'jinja')
+        run(args)
+
+
+def run(args):
+    from app import app, init_db, Flashcard
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+    with app.app_context():
+        init_db()
+        cards = [(card.id, card.category) for card in Flashcard.query.all()]
+
+    client = app.test_client()
+    email = f'bench-answers-{uuid.uuid4().hex[:8]}@example.com'
+    client.post('/register', json={'name': 'Bench', 'email': email, 'password': 'password123'})
+    client.post('/login', json={'email': email, 'password': 'password123'})
+
+    answers = [cards[i % len(cards)] for i in range(args.answers)]
+
+    start = time.perf_counter()
+    for i, (_, category) in enumerate(answers):
+        response = client.post('/save-progress', json={
+            'category': category, 'score': i % 4, 'percentage': (i % 4) * 33.3, 'completed': True
+        })
+        assert response.status_code == 200
+    per_request = args.answers / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for offset in range(0, args.answers, args.batch_size):
+        batch = [{
+            'card_id': card_id,
+            'option': 0,
+            'answered_at': '2024-01-01T00:00:00Z',
+            'idempotency_key': uuid.uuid4().hex
+        } for card_id, _ in answers[offset:offset + args.batch_size]]
+        response = client.post('/api/answers/batch', json={'answers': batch})
+        assert response.status_code == 200, response.data
+    batched = args.answers / (time.perf_counter() - start)
+
+    print(f"{args.answers} respuestas")
+    batch_label = f'/api/answers/batch (lotes de {args.batch_size})'
+    print(f"  {'/save-progress (1 por petición)':<38} {per_request:10.0f} respuestas/s")
+    print(f"  {batch_label:<38} {batched:10.0f} respuestas/s  ({batched / per_request:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
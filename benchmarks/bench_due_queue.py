@@ -0,0 +1,122 @@
+# Benchmark de la cola de repaso: latencia de "las próximas N tarjetas" para un
+# usuario con 10 tarjetas frente a uno con miles, sobre una tabla de estados
+# de repaso de ~1M filas. Usa las mismas consultas que /api/review/due. Incluye
+# un usuario que ya ha visto casi toda la baraja y no tiene nada pendiente, el
+# peor caso para la búsqueda de tarjetas nuevas, con y sin cursor.
+#
+#   python benchmarks/bench_due_queue.py --rows 1000000 --cards-per-user 5000
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import db, due_cards_query, new_cards_query, pick_new_cards
+
+
+# Tarjetas sin ver al final de la baraja del usuario que lo ha visto casi todo
+UNSEEN_TAIL = 5
+
+
+def populate(engine, rows, cards_per_user, seed):
+    # Devuelve (estados cargados, id del usuario que lo ha visto casi todo)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    users = max(2, rows // cards_per_user)
+    connection = engine.raw_connection()
+    cursor = connection.cursor()
+    cursor.executemany(
+        'INSERT INTO user (id, name, email, password_hash) VALUES (?, ?, ?, ?)',
+        [(user_id, 'Alumno', f'alumno{user_id}@example.com', 'x') for user_id in range(1, users + 2)]
+    )
+    cursor.executemany(
+        'INSERT INTO flashcard (id, category, question, options, correct_option) VALUES (?, ?, ?, ?, ?)',
+        [(card_id, f'cat{card_id % 10}', f'¿Pregunta {card_id}?', '["a", "b"]', 0)
+         for card_id in range(1, cards_per_user + 1)]
+    )
+
+    def states():
+        # El usuario 1 tiene 10 tarjetas; el resto, cards_per_user cada uno
+        for user_id in range(1, users + 1):
+            count = 10 if user_id == 1 else cards_per_user
+            for card_id in range(1, count + 1):
+                due = now + timedelta(minutes=rng.randint(-60 * 24 * 30, 60 * 24 * 30))
+                yield (user_id, card_id, f'cat{card_id % 10}', 1, 1.0, 2.5, due.isoformat(' '))
+        # Y uno más que lo ha visto todo salvo el final, sin nada que repasar hoy
+        for card_id in range(1, cards_per_user - UNSEEN_TAIL + 1):
+            due = now + timedelta(days=rng.randint(1, 30))
+            yield (users + 1, card_id, f'cat{card_id % 10}', 3, 10.0, 2.5, due.isoformat(' '))
+
+    cursor.executemany(
+        'INSERT INTO card_review_state (user_id, card_id, category, repetitions, interval_days, ease, due_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        states()
+    )
+    connection.commit()
+    cursor.execute('SELECT count(*) FROM card_review_state')
+    total = cursor.fetchone()[0]
+    cursor.execute('ANALYZE')
+    connection.close()
+    return total, users + 1
+
+
+def measure(session, user_id, limit, category, repeat, cursor):
+    # Con cursor se hace como /api/review/due: pick_new_cards y commit si avanza
+    times = []
+    now = datetime.utcnow()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cards = session.execute(due_cards_query(user_id, now, limit, category)).all()
+        if len(cards) < limit:
+            if cursor:
+                pick_new_cards(session, user_id, limit - len(cards), category)
+                if session.new or session.dirty:
+                    session.commit()
+            else:
+                session.execute(new_cards_query(user_id, limit - len(cards), category)).all()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia de la cola de repaso con ~1M estados')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--cards-per-user', type=int, default=5000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine('sqlite:///' + os.path.join(directory, 'due.db'))
+        db.metadata.create_all(engine)
+        start = time.perf_counter()
+        total, nearly_done = populate(engine, args.rows, args.cards_per_user, args.seed)
+        print(f"{total} estados de repaso cargados en {time.perf_counter() - start:.1f} s")
+
+        users = [
+            ('usuario con 10 tarjetas', 1),
+            (f'usuario con {args.cards_per_user} tarjetas', 2),
+            ('casi todo visto, nada pendiente', nearly_done),
+        ]
+        with Session(engine) as session:
+            for label, user_id in users:
+                for category in (None, 'cat3'):
+                    scope = 'todas las categorías' if category is None else f'categoría {category}'
+                    for cursor in (False, True):
+                        median = measure(session, user_id, args.limit, category, args.repeat, cursor)
+                        mode = 'con cursor' if cursor else 'sin cursor'
+                        print(f"  {label:<32} {scope:<22} {mode:<11} mediana {median * 1000:7.3f} ms")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Micro-benchmark: costo de serializar un mazo cuando las opciones se guardan
+# como str(list) y se leen con eval(), frente a la columna JSON nativa.
+#
+#   python benchmarks/bench_flashcard_options.py --cards 10000
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+
+def build_deck(num_cards, as_string):
+    cards = []
+    for i in range(num_cards):
+        options = [f'Opción {i}-{j}' for j in range(4)]
+        cards.append(SimpleNamespace(
+            id=i,
+            question=f'¿Pregunta número {i}?',
+            image_url=f'https://example.com/img/{i}.png',
+            options=str(options) if as_string else options,
+            correct_option=0,
+            feedback='¡Muy bien!'
+        ))
+    return cards
+
+
+def serialize(cards, parse):
+    return json.dumps([{
+        'id': card.id,
+        'question': card.question,
+        'image_url': card.image_url,
+        'options': parse(card.options),
+        'correct_option': card.correct_option,
+        'feedback': card.feedback
+    } for card in cards])
+
+
+def measure(cards, parse, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(cards, parse)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Costo de serialización de Flashcard.options')
+    parser.add_argument('--cards', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    before = measure(build_deck(args.cards, as_string=True), eval, args.repeat)
+    # Con la columna JSON el driver ya entrega la lista; json.loads sobre el
+    # texto crudo representa el peor caso (SQLite guarda JSON como texto).
+    raw_json = build_deck(args.cards, as_string=False)
+    for card in raw_json:
+        card.options = json.dumps(card.options)
+    after_sqlite = measure(raw_json, json.loads, args.repeat)
+    after_native = measure(build_deck(args.cards, as_string=False), lambda options: options, args.repeat)
+
+    print(f"{args.cards} tarjetas (mejor de {args.repeat})")
+    for label, seconds in [
+        ('eval(str(list))', before),
+        ('json.loads (SQLite JSON)', after_sqlite),
+        ('lista nativa (JSONB)', after_native),
+    ]:
+        print(f"  {label:<26} {seconds * 1000:8.2f} ms  {seconds / args.cards * 1e6:6.2f} µs/tarjeta")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Benchmark de logins a la escala de un aula: N alumnos inician sesión a la vez
+# mientras otro cliente pide una página ligera. Mide logins/s y la latencia de
+# la página ligera durante la ola de logins.
+#
+#   python benchmarks/bench_login.py --students 30 --hash-workers 2
+#
+# Por defecto trabaja sobre una base SQLite temporal (--sqlite-path para usar otra).
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rendimiento de login con concurrencia de aula')
+    parser.add_argument('--students', type=int, default=30)
+    parser.add_argument('--hash-workers', type=int, default=2)
+    parser.add_argument('--method', default=None, help='PASSWORD_HASH_METHOD a probar')
+    parser.add_argument('--sqlite-path', help='base SQLite; por defecto una temporal')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-login-') as workdir:
+        # El módulo lee la configuración del entorno al importarse
+        os.environ.pop('DATABASE_URL', None)
+        os.environ['SQLITE_PATH'] = args.sqlite_path or os.path.join(workdir, 'bench.db')
+        os.environ['TEMPLATE_CACHE_DIR'] = os.path.join(workdir, 'jinja')
+        run(args)
+
+
+def run(args):
+    os.environ['PASSWORD_HASH_WORKERS'] = str(args.hash_workers)
+    if args.method:
+        os.environ['PASSWORD_HASH_METHOD'] = args.method
+
+    from app import app, db, init_db, User
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+    emails = [f'bench-login-{i}@example.com' for i in range(args.students)]
+    with app.app_context():
+        init_db()
+        existing = {email for (email,) in db.session.query(User.email).filter(User.email.in_(emails))}
+        for email in emails:
+            if email not in existing:
+                user = User(name='Alumno', email=email)
+                user.set_password('password123')
+                db.session.add(user)
+        db.session.commit()
+
+    login_times = []
+    page_times = []
+    done = threading.Event()
+
+    def student(email):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/login', json={'email': email, 'password': 'password123'})
+        login_times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.data
+
+    def visitor():
+        client = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get('/')
+            page_times.append(time.perf_counter() - start)
+
+    watcher = threading.Thread(target=visitor)
+    watcher.start()
+    threads = [threading.Thread(target=student, args=(email,)) for email in emails]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+
+    print(f"{args.students} logins concurrentes, {args.hash_workers} hilos de hash")
+    print(f"  logins/s                 {args.students / elapsed:8.1f}")
+    print(f"  login p50 / p95          {statistics.median(login_times) * 1000:8.1f} / {percentile(login_times, 0.95) * 1000:.1f} ms")
+    if page_times:
+        print(f"  página '/' p50 / p95     {statistics.median(page_times) * 1000:8.1f} / {percentile(page_times, 0.95) * 1000:.1f} ms ({len(page_times)} peticiones)")
+
+
+if __name__ == '__main__':
+    main()
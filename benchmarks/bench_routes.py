@@ -0,0 +1,358 @@
+# Benchmark por ruta de la aplicación: latencias p50/p95/p99 y peticiones/s de
+# las rutas principales, con el test client de Flask o contra un gunicorn real
+# en localhost, sobre SQLite (una base temporal) o sobre PostgreSQL.
+#
+#   python benchmarks/bench_routes.py --mode client --concurrency 4 --output base.json
+#   python benchmarks/bench_routes.py --mode gunicorn --database-url postgresql://localhost/bench
+#   python benchmarks/bench_routes.py --output nuevo.json --compare base.json --threshold 0.2
+#   python benchmarks/bench_routes.py --results nuevo.json --compare base.json
+#
+# Para curvas de escalado, se ejecuta sobre bases de distinto tamaño generadas
+# con benchmarks/generate_dataset.py (--sqlite-path o --database-url).
+#
+# Con --compare el proceso termina con código 1 si alguna ruta empeora más que
+# el umbral (p95 más alto o peticiones/s más bajas) o devuelve algún error,
+# para usarlo como control en CI.
+import argparse
+import http.client
+import http.cookies
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = 'password123'
+CATEGORIES = ('emociones', 'conceptos', 'entorno')
+
+
+def route_request(route, i):
+    # (método, ruta, cuerpo JSON) de la petición número i de cada ruta
+    category = CATEGORIES[i % len(CATEGORIES)]
+    if route == 'login':
+        return 'POST', '/login', None
+    if route == 'dashboard':
+        return 'GET', '/dashboard', None
+    if route == 'flashcards':
+        return 'GET', f'/api/flashcards/{category}', None
+    if route == 'save_progress':
+        return 'POST', '/save-progress', {
+            'category': category, 'score': i % 4, 'percentage': (i % 4) * 33.3, 'completed': i % 4 == 3
+        }
+    if route == 'progress':
+        return 'GET', '/progress', None
+    if route == 'get_all_progress':
+        return 'GET', '/get-all-progress', None
+    raise ValueError(route)
+
+
+ROUTES = ('login', 'dashboard', 'flashcards', 'save_progress', 'progress', 'get_all_progress')
+
+
+class TestClientSession:
+    # Un usuario con su propio test client (y su cookie de sesión)
+    def __init__(self, app, email):
+        self.client = app.test_client()
+        self.email = email
+
+    def request(self, method, path, body):
+        if path == '/login':
+            body = {'email': self.email, 'password': PASSWORD}
+        response = self.client.open(path, method=method, json=body)
+        response.close()
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class HTTPSession:
+    # Un usuario con una conexión HTTP/1.1 persistente a gunicorn
+    def __init__(self, port, email):
+        self.port = port
+        self.email = email
+        self.cookies = {}
+        self.connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+    def request(self, method, path, body):
+        if path == '/login':
+            body = {'email': self.email, 'password': PASSWORD}
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # El servidor cerró la conexión: reconectamos una vez
+            self.connection.close()
+            self.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+        response.read()
+        for header in response.headers.get_all('Set-Cookie') or []:
+            cookie = http.cookies.SimpleCookie(header)
+            for name, morsel in cookie.items():
+                self.cookies[name] = morsel.value
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+def percentile(sorted_values, fraction):
+    # Percentil por rango más cercano
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_route(route, sessions, total_requests):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def worker(session):
+        nonlocal errors
+        local = []
+        local_errors = 0
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            method, path, body = route_request(route, i)
+            start = time.perf_counter()
+            try:
+                status = session.request(method, path, body)
+            except Exception:
+                status = 0
+            local.append((time.perf_counter() - start) * 1000)
+            if status >= 400 or status == 0:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        list(executor.map(worker, sessions))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def bench_env(args, workdir):
+    env = dict(os.environ)
+    if args.database_url:
+        env['DATABASE_URL'] = args.database_url
+    else:
+        env.pop('DATABASE_URL', None)
+        env['SQLITE_PATH'] = args.sqlite_path or os.path.join(workdir, 'bench.db')
+    env['TEMPLATE_CACHE_DIR'] = os.path.join(workdir, 'jinja')
+    return env
+
+
+def create_users(register, count):
+    emails = []
+    for _ in range(count):
+        email = f'bench-routes-{uuid.uuid4().hex[:12]}@example.com'
+        status = register(email)
+        if status not in (200, 201):
+            raise SystemExit(f"No se pudo registrar el usuario de prueba ({status})")
+        emails.append(email)
+    return emails
+
+
+def client_sessions(args, workdir):
+    # El módulo lee la configuración del entorno al importarse
+    env = bench_env(args, workdir)
+    if 'DATABASE_URL' not in env:
+        os.environ.pop('DATABASE_URL', None)
+    os.environ.update(env)
+    from app import app, init_db
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+    with app.app_context():
+        init_db()
+
+    def register(email):
+        response = app.test_client().post('/register', json={'name': 'Bench', 'email': email, 'password': PASSWORD})
+        return response.status_code
+
+    sessions = [TestClientSession(app, email) for email in create_users(register, args.concurrency)]
+    for session in sessions:
+        session.request('POST', '/login', None)
+    return sessions, None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def gunicorn_sessions(args, workdir):
+    env = bench_env(args, workdir)
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'bootstrap'], cwd=ROOT, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+
+    port = free_port()
+    env['WEB_CONCURRENCY'] = str(args.workers)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '-c', 'gunicorn.conf.py', '-b', f'127.0.0.1:{port}'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                break
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise SystemExit("gunicorn no arrancó")
+            time.sleep(0.2)
+
+    def register(email):
+        session = HTTPSession(port, email)
+        try:
+            return session.request('POST', '/register', {'name': 'Bench', 'email': email, 'password': PASSWORD})
+        finally:
+            session.close()
+
+    sessions = [HTTPSession(port, email) for email in create_users(register, args.concurrency)]
+    for session in sessions:
+        session.request('POST', '/login', None)
+    return sessions, server
+
+
+def run_benchmark(args):
+    with tempfile.TemporaryDirectory(prefix='bench-routes-') as workdir:
+        setup = client_sessions if args.mode == 'client' else gunicorn_sessions
+        sessions, server = setup(args, workdir)
+        try:
+            for session in sessions:
+                for i in range(args.warmup):
+                    session.request(*route_request('flashcards', i))
+            results = {}
+            for route in args.routes:
+                # El login calcula un hash de contraseña: usamos menos peticiones
+                total = max(args.concurrency, args.requests // 10) if route == 'login' else args.requests
+                results[route] = run_route(route, sessions, total)
+                print(format_row(route, results[route]))
+        finally:
+            for session in sessions:
+                session.close()
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    return {
+        'meta': {
+            'mode': args.mode,
+            'database': 'postgresql' if args.database_url else 'sqlite',
+            'sqlite_path': args.sqlite_path,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'workers': args.workers if args.mode == 'gunicorn' else None,
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        },
+        'routes': results,
+    }
+
+
+def format_row(route, stats):
+    return (f"  {route:<18} {stats['rps']:9.1f} req/s  p50 {stats['p50_ms']:8.2f} ms  "
+            f"p95 {stats['p95_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms  errores {stats['errors']}")
+
+
+def compare(baseline, current, threshold):
+    # Devuelve la lista de regresiones: p95 por encima o req/s por debajo del
+    # umbral, o cualquier respuesta con error
+    regressions = []
+    for route, stats in current['routes'].items():
+        base = baseline['routes'].get(route)
+        errors = stats.get('errors', 0)
+        if base is None:
+            if errors:
+                print(f"  {route:<18} {errors} errores  REGRESIÓN")
+                regressions.append(route)
+            continue
+        p95_change = (stats['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+        rps_change = (stats['rps'] - base['rps']) / base['rps'] if base['rps'] else 0.0
+        failed = p95_change > threshold or rps_change < -threshold or errors > 0
+        print(f"  {route:<18} p95 {p95_change:+7.1%}  req/s {rps_change:+7.1%}  errores {errors:>4}  "
+              f"{'REGRESIÓN' if failed else 'ok'}")
+        if failed:
+            regressions.append(route)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencias y peticiones/s por ruta de la aplicación')
+    parser.add_argument('--mode', choices=('client', 'gunicorn'), default='client')
+    parser.add_argument('--database-url', help='PostgreSQL; por defecto una base SQLite temporal')
+    parser.add_argument('--sqlite-path', help='usa esta base SQLite (p. ej. la de generate_dataset.py)')
+    parser.add_argument('--concurrency', type=int, default=4, help='usuarios simultáneos')
+    parser.add_argument('--requests', type=int, default=500, help='peticiones por ruta')
+    parser.add_argument('--warmup', type=int, default=5, help='peticiones de calentamiento por usuario')
+    parser.add_argument('--workers', type=int, default=2, help='workers de gunicorn (modo gunicorn)')
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=list(ROUTES))
+    parser.add_argument('--output', help='guarda los resultados en este JSON')
+    parser.add_argument('--results', help='no ejecuta el benchmark: usa este JSON como resultado actual')
+    parser.add_argument('--compare', help='JSON de referencia con el que comparar')
+    parser.add_argument('--threshold', type=float, default=0.2, help='empeoramiento tolerado (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results, encoding='utf-8') as f:
+            results = json.load(f)
+    else:
+        print(f"Modo {args.mode}, {args.concurrency} usuarios, {args.requests} peticiones por ruta")
+        results = run_benchmark(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Resultados guardados en {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparación con {args.compare} (umbral {args.threshold:.0%})")
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"Rutas con regresión: {', '.join(regressions)}")
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# Benchmark de escrituras concurrentes en SQLite: N hilos escritores haciendo
+# el upsert de progreso de la aplicación (upsert_progress, con su resumen en
+# ProgressRollup), con los valores por defecto de SQLite y con el perfil de
+# pragmas que aplica app.py (SQLITE_PRAGMAS).
+#
+#   python benchmarks/bench_sqlite_writes.py --threads 8 --writes 500
+#
+# Cada perfil se ejecuta en un proceso aparte sobre una base temporal, porque
+# app.py lee los pragmas del entorno al importarse.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Valores por defecto de SQLite; el timeout de 5 s es el del módulo sqlite3
+DEFAULT_PROFILE = {
+    'SQLITE_JOURNAL_MODE': 'DELETE',
+    'SQLITE_SYNCHRONOUS': 'FULL',
+    'SQLITE_CACHE_SIZE': '-2000',
+    'SQLITE_MMAP_SIZE': '0',
+    'SQLITE_BUSY_TIMEOUT_MS': '5000',
+}
+# Sin variables: los valores por defecto de SQLITE_PRAGMAS en app.py
+TUNED_PROFILE = {}
+
+
+def writer(thread_id, writes, results):
+    from sqlalchemy.exc import OperationalError
+    from app import app, db, upsert_progress
+
+    ok = errors = 0
+    with app.app_context():
+        for i in range(writes):
+            try:
+                upsert_progress(
+                    user_id=thread_id * writes + i % 50,
+                    category='emociones',
+                    score=i % 4,
+                    percentage=(i % 4) * 33.3,
+                    completed_cards=i % 4,
+                    completed=bool(i % 2),
+                    total_cards=3
+                )
+                db.session.commit()
+                ok += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+    results.append((ok, errors))
+
+
+def run_profile(threads, writes):
+    # Se ejecuta en el proceso hijo, con el entorno del perfil ya aplicado
+    from app import app, init_db, SQLITE_PRAGMAS
+
+    with app.app_context():
+        init_db()
+
+    results = []
+    workers = [threading.Thread(target=writer, args=(t, writes, results)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'rate': sum(r[0] for r in results) / elapsed,
+        'errors': sum(r[1] for r in results),
+        'pragmas': SQLITE_PRAGMAS
+    }))
+
+
+def run(profile, threads, writes):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ)
+        env.pop('DATABASE_URL', None)
+        env.update(profile)
+        env['SQLITE_PATH'] = os.path.join(directory, 'bench.db')
+        env['TEMPLATE_CACHE_DIR'] = os.path.join(directory, 'jinja')
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--threads', str(threads), '--writes', str(writes), '--child'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.PIPE, text=True
+        ).stdout
+    # app.py imprime mensajes al importarse: el resultado es la última línea
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Escrituras/seg en SQLite con N hilos')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=500, help='escrituras por hilo')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_profile(args.threads, args.writes)
+        return
+
+    print(f"{args.threads} hilos x {args.writes} escrituras")
+    for label, profile in [('por defecto (rollback journal)', DEFAULT_PROFILE), ('WAL + pragmas', TUNED_PROFILE)]:
+        result = run(profile, args.threads, args.writes)
+        pragmas = ', '.join(f'{name}={value}' for name, value in result['pragmas'].items())
+        print(f"  {label:<32} {result['rate']:10.0f} escrituras/s   errores 'database is locked': {result['errors']}")
+        print(f"    {pragmas}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# Benchmark de arranque en frío de un worker: tiempo de `import app` (lo que
+# hace cada worker de gunicorn) frente a importar y además ejecutar init_db(),
+# que es lo que ocurría en cada import antes del comando `flask bootstrap`.
+#
+#   python benchmarks/bench_startup.py --runs 5
+#
+# Por defecto trabaja sobre una base SQLite temporal (--sqlite-path para usar otra).
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import + init_db (antes)': 'import app\nwith app.app.app_context():\n    app.init_db()',
+    'solo import (ahora)': 'import app',
+}
+
+
+def measure(code, runs, env):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de arranque de un worker')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--sqlite-path', help='base SQLite; por defecto una temporal')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-startup-') as workdir:
+        env = dict(os.environ)
+        env.pop('DATABASE_URL', None)
+        env['SQLITE_PATH'] = args.sqlite_path or os.path.join(workdir, 'bench.db')
+        env['TEMPLATE_CACHE_DIR'] = os.path.join(workdir, 'jinja')
+
+        # La base debe existir para que ambos escenarios midan el caso de un redeploy
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'bootstrap'], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        for label, code in SCENARIOS.items():
+            times = measure(code, args.runs, env)
+            print(f"  {label:<28} mediana {statistics.median(times) * 1000:8.1f} ms   mín {min(times) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Benchmark de renderizado de páginas: render_template_string (parsea y compila
+# la plantilla en cada petición) frente a render_template con el loader y la
+# caché de plantillas compiladas. Comprueba además que el HTML sea idéntico.
+#
+#   python benchmarks/bench_templates.py --iterations 200
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import render_template, render_template_string
+
+from app import app, PAGE_TEMPLATES
+
+USER = SimpleNamespace(name='Alumno', email='alumno@example.com', profile_photo='https://i.pravatar.cc/300', is_authenticated=True)
+
+CONTEXTS = {
+    'home.html': {},
+    'dashboard.html': {
+        'current_user': USER,
+        'study_fields': [{
+            'name': 'Desarrollo Emocional', 'route': 'emociones', 'icon': '😊', 'color': '#FF9800',
+            'description': 'Aprende sobre emociones', 'progress': 66.7, 'completed_cards': 2,
+            'total_cards': 3, 'completed': False
+        }] * 3
+    },
+    'profile.html': {'current_user': USER},
+    'progress.html': {
+        'current_user': USER,
+        'progress_data': [{
+            'name': 'Conceptos Básicos', 'icon': '📚', 'color': '#4CAF50', 'completed_cards': 1,
+            'total_cards': 3, 'best_score': 2, 'last_activity': '01/01/2024', 'progress': 66.7
+        }] * 3
+    },
+    'flashcards.html': {},
+}
+
+
+def measure(render, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de renderizado por página')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'página':<18} {'string (ms)':>12} {'loader (ms)':>12} {'mejora':>8}")
+    with app.test_request_context('/'):
+        for name, context in CONTEXTS.items():
+            source = PAGE_TEMPLATES[name]
+            assert render_template_string(source, **context) == render_template(name, **context)
+            before = measure(lambda: render_template_string(source, **context), args.iterations)
+            after = measure(lambda: render_template(name, **context), args.iterations)
+            print(f"{name:<18} {before * 1000:12.3f} {after * 1000:12.3f} {before / after:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+# Generador de datos sintéticos a escala de producción para pruebas de
+# capacidad: categorías, miles de tarjetas por categoría, usuarios con
+# actividad muy desigual (pocos usuarios concentran la mayoría de los intentos)
+# y su historial de progreso y de respuestas.
+#
+#   python benchmarks/generate_dataset.py --sqlite-path /tmp/capacidad.db --users 1000000 --cards-per-category 2000
+#   python benchmarks/generate_dataset.py --database-url postgresql://localhost/bench --users 1000000
+#
+# Es determinista: con la misma --seed y la misma --anchor cada usuario y cada
+# tarjeta salen siempre iguales. Cada lote se guarda en su propia transacción,
+# así que si se interrumpe basta con volver a lanzarlo con los mismos
+# parámetros y continúa donde se quedó. Los usuarios sintéticos usan la
+# contraseña 'password123' (un único hash para todos).
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = 'password123'
+PROFILE_PHOTO = 'https://i.pravatar.cc/300'
+# Los usuarios sintéticos tienen ids a partir de aquí para no mezclarse con los reales
+USER_ID_BASE = 10_000_000
+CARD_PREFIX = 'Tarjeta sintética'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+class SQLiteLoader:
+    # executemany sobre la conexión DB-API, un lote grande por transacción
+    placeholder = '?'
+
+    def __init__(self, connection, quote):
+        self.connection = connection
+        self.quote = quote
+
+    def insert(self, table, columns, rows):
+        if not rows:
+            return
+        sql = (f'INSERT INTO {self.quote(table)} ({", ".join(self.quote(c) for c in columns)}) '
+               f'VALUES ({", ".join([self.placeholder] * len(columns))})')
+        cursor = self.connection.cursor()
+        cursor.executemany(sql, rows)
+        cursor.close()
+
+    def commit(self):
+        self.connection.commit()
+
+
+class PostgresCopyLoader(SQLiteLoader):
+    # COPY ... FROM STDIN en CSV: mucho más rápido que INSERT fila a fila
+    placeholder = '%s'
+
+    def insert(self, table, columns, rows):
+        if not rows:
+            return
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = self.connection.cursor()
+        cursor.copy_expert(
+            f'COPY {self.quote(table)} ({", ".join(self.quote(c) for c in columns)}) FROM STDIN WITH (FORMAT csv)',
+            buffer
+        )
+        cursor.close()
+
+
+def fmt(value):
+    return value.strftime(DATETIME_FORMAT)
+
+
+def scalar(connection, sql, params=()):
+    cursor = connection.cursor()
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else None
+
+
+def ensure_categories(loader, connection, extra):
+    # Categorías sintéticas además de las que carga bootstrap
+    ph = loader.placeholder
+    rows = []
+    for n in range(1, extra + 1):
+        key = f'sintetica-{n:02d}'
+        if scalar(connection, f'SELECT COUNT(*) FROM category WHERE key = {ph}', (key,)):
+            continue
+        rows.append((key, f'Categoría sintética {n}', '🧪', '#9E9E9E', 'Datos generados para pruebas de capacidad', 100 + n))
+    loader.insert('category', ('key', 'name', 'icon', 'color', 'description', 'sort_order'), rows)
+    loader.commit()
+
+    cursor = connection.cursor()
+    cursor.execute('SELECT key FROM category ORDER BY sort_order, key')
+    categories = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return categories
+
+
+def generate_cards(loader, connection, categories, per_category, seed, chunk):
+    ph = loader.placeholder
+    columns = ('category', 'question', 'image_url', 'options', 'correct_option', 'feedback', 'created_at')
+    for category in categories:
+        existing = scalar(
+            connection,
+            f'SELECT COUNT(*) FROM flashcard WHERE category = {ph} AND question LIKE {ph}',
+            (category, CARD_PREFIX + ' %')
+        )
+        cursor = connection.cursor()
+        cursor.execute(f'SELECT DISTINCT image_url FROM flashcard WHERE category = {ph} AND image_url IS NOT NULL '
+                       f'ORDER BY image_url', (category,))
+        images = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+
+        rows = []
+        for n in range(existing, per_category):
+            rng = random.Random(f'{seed}:card:{category}:{n}')
+            options = [f'Respuesta {n}-{j}' for j in range(rng.choice((2, 3, 4)))]
+            rows.append((
+                category,
+                f'{CARD_PREFIX} {n} de {category}',
+                rng.choice(images) if images else None,
+                json.dumps(options),
+                rng.randrange(len(options)),
+                f'La respuesta correcta es {options[0]}',
+                fmt(datetime(2024, 1, 1) + timedelta(minutes=n))
+            ))
+            if len(rows) >= chunk:
+                loader.insert('flashcard', columns, rows)
+                loader.commit()
+                rows = []
+        loader.insert('flashcard', columns, rows)
+        loader.commit()
+        print(f"Tarjetas de {category}: {max(existing, per_category)}")
+
+
+def simulate_user(i, seed, anchor, history_days, categories, decks, max_events, events_factor):
+    # Devuelve las filas de un usuario: (user, [progress], [rollup], [events])
+    rng = random.Random(f'{seed}:user:{i}')
+    user_id = USER_ID_BASE + i
+    created_at = anchor - timedelta(days=history_days * rng.random() ** 0.7, seconds=rng.randrange(86400))
+    user = (user_id, f'Usuario {i}', f'synthetic-{i}@example.com', created_at)
+
+    # Actividad con cola larga (Pareto): la mayoría hace pocos intentos y unos
+    # pocos usuarios hacen muchísimos
+    activity = rng.paretovariate(1.16) - 1
+    skill = rng.betavariate(5, 2)
+    progress, rollups, events = [], [], []
+    events_left = max_events
+    for category in categories:
+        if rng.random() > min(0.95, 0.25 + activity * 0.3):
+            continue
+        attempts = 1 + min(200, int(activity * rng.expovariate(0.5)))
+        deck = decks[category]
+        total = len(deck)
+        answered = correct = completed_count = 0
+        span = (anchor - created_at).total_seconds()
+        times = sorted(created_at + timedelta(seconds=span * (1 - rng.random() ** 2)) for _ in range(attempts))
+        for when in times:
+            batch = rng.randint(3, 30)
+            batch_correct = sum(rng.random() < skill for _ in range(batch))
+            # Se generan eventos para una parte de las respuestas de cada intento
+            for _ in range(min(events_left, int(batch * events_factor))):
+                # Como las respuestas reales de /api/answers/batch: la opción está
+                # dentro de las de la tarjeta y 'correct' sale de compararla
+                card_id, option_count, correct_option = deck[rng.randrange(total)]
+                option = correct_option
+                if rng.random() >= skill:
+                    option = rng.choice([o for o in range(option_count) if o != correct_option] or [correct_option])
+                events.append((
+                    user_id, card_id, option, option == correct_option,
+                    int(rng.lognormvariate(8, 0.6)), fmt(when + timedelta(seconds=rng.randrange(600)))
+                ))
+                events_left -= 1
+            answered = min(total, answered + batch)
+            correct = min(answered, correct + batch_correct)
+            completed_count += answered >= total
+
+        percentage = round(correct / total * 100, 1)
+        last_activity = fmt(times[-1])
+        progress.append((user_id, category, correct, percentage, answered, total, answered >= total, last_activity))
+        rollups.append((user_id, category, correct, percentage, answered, completed_count, attempts, last_activity))
+    return user, progress, rollups, events
+
+
+def generate_users(loader, connection, args, categories, decks, password_hash):
+    start_index = 0
+    last_id = scalar(connection, f'SELECT MAX(id) FROM {loader.quote("user")} WHERE id >= {USER_ID_BASE}')
+    if last_id is not None:
+        start_index = last_id - USER_ID_BASE + 1
+        print(f"Reanudando en el usuario {start_index}")
+
+    anchor = datetime.fromisoformat(args.anchor)
+    started = time.perf_counter()
+    for chunk_start in range(start_index, args.users, args.chunk):
+        users, progress, rollups, events = [], [], [], []
+        for i in range(chunk_start, min(chunk_start + args.chunk, args.users)):
+            user, user_progress, user_rollups, user_events = simulate_user(
+                i, args.seed, anchor, args.history_days, categories, decks, args.max_events_per_user, args.events
+            )
+            users.append((user[0], user[1], user[2], password_hash, PROFILE_PHOTO, fmt(user[3])))
+            progress.extend(user_progress)
+            rollups.extend(user_rollups)
+            events.extend(user_events)
+
+        loader.insert('user', ('id', 'name', 'email', 'password_hash', 'profile_photo', 'created_at'), users)
+        loader.insert('user_progress', ('user_id', 'category', 'score', 'percentage', 'completed_cards',
+                                        'total_cards', 'completed', 'updated_at'), progress)
+        loader.insert('progress_rollup', ('user_id', 'category', 'best_score', 'best_percentage', 'completed_cards',
+                                          'completed_count', 'attempts', 'last_activity'), rollups)
+        loader.insert('answer_event', ('user_id', 'card_id', 'option', 'correct', 'latency_ms', 'answered_at'), events)
+        loader.commit()
+
+        done = min(chunk_start + args.chunk, args.users)
+        rate = (done - start_index) / (time.perf_counter() - started)
+        print(f"Usuarios: {done}/{args.users}  ({rate:.0f}/s, {len(progress)} progresos, {len(events)} eventos en el lote)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera un conjunto de datos sintético para pruebas de capacidad')
+    parser.add_argument('--database-url', help='PostgreSQL; por defecto la base SQLite de la aplicación')
+    parser.add_argument('--sqlite-path', help='base SQLite de destino')
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--cards-per-category', type=int, default=2000)
+    parser.add_argument('--extra-categories', type=int, default=0, help='categorías sintéticas adicionales')
+    parser.add_argument('--history-days', type=int, default=730, help='antigüedad máxima de los usuarios')
+    parser.add_argument('--events', type=float, default=0.1, help='fracción de respuestas con evento en answer_event')
+    parser.add_argument('--max-events-per-user', type=int, default=500)
+    parser.add_argument('--anchor', default='2025-06-01T00:00:00', help='fecha de referencia fija de los historiales')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk', type=int, default=10000, help='usuarios o tarjetas por transacción')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    elif args.sqlite_path:
+        os.environ.pop('DATABASE_URL', None)
+        os.environ['SQLITE_PATH'] = os.path.abspath(args.sqlite_path)
+    from app import app, db, init_db, hash_password
+
+    with app.app_context():
+        init_db()
+        quote = db.engine.dialect.identifier_preparer.quote
+        is_postgres = db.engine.dialect.name == 'postgresql'
+        connection = db.engine.raw_connection()
+        try:
+            loader = (PostgresCopyLoader if is_postgres else SQLiteLoader)(connection, quote)
+
+            categories = ensure_categories(loader, connection, args.extra_categories)
+            generate_cards(loader, connection, categories, args.cards_per_category, args.seed, args.chunk)
+
+            decks = {}
+            cursor = connection.cursor()
+            for category in categories:
+                cursor.execute(f'SELECT id, options, correct_option FROM flashcard WHERE category = {loader.placeholder} '
+                               f'ORDER BY id', (category,))
+                decks[category] = [
+                    (card_id, len(options if isinstance(options, list) else json.loads(options)), correct_option)
+                    for card_id, options, correct_option in cursor.fetchall()
+                ]
+            cursor.close()
+            categories = [category for category in categories if decks[category]]
+
+            generate_users(loader, connection, args, categories, decks, hash_password(PASSWORD))
+
+            if is_postgres:
+                # Los ids explícitos no avanzan la secuencia de user.id
+                cursor = connection.cursor()
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{quote('user')}', 'id'), "
+                    f"(SELECT MAX(id) FROM {quote('user')}))"
+                )
+                cursor.close()
+                connection.commit()
+        finally:
+            connection.close()
+
+    print("Conjunto de datos generado")
+
+
+if __name__ == '__main__':
+    main()
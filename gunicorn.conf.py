@@ -0,0 +1,23 @@
+import os
+
+# Workers con hilos: mientras un hilo espera el hash de una contraseña (o la
+# base de datos), los demás siguen atendiendo peticiones del mismo worker.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+
+def post_worker_init(worker):
+    # Precarga los mazos en la caché del worker antes de atender peticiones
+    from app import app, warm_deck_cache
+
+    with app.app_context():
+        warm_deck_cache()
+
+
+def worker_exit(server, worker):
+    # Escribe los eventos de respuesta que sigan en la cola antes de salir
+    from app import answer_writer
+
+    answer_writer.stop()
@@ -0,0 +1,148 @@
+import base64
+import hashlib
+import io
+import os
+import re
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:
+    Image = None
+
+# Almacén local de imágenes direccionado por contenido: cada imagen se guarda
+# una sola vez como <sha256>.<ext>, así el nombre cambia si cambian los bytes
+# y se puede servir con Cache-Control: immutable. Las imágenes se obtienen con
+# un "fetcher": cualquier función que reciba la URL original y devuelva los
+# bytes (descarga HTTP, un directorio local, o lo que haga falta).
+MEDIA_DIR = os.environ.get(
+    'MEDIA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media')
+)
+# <sha256>.<ext> para el original y <sha256>-<ancho>.<ext> para sus variantes
+MEDIA_NAME_RE = re.compile(r'^[0-9a-f]{64}(-[0-9]+)?\.(png|jpg|gif|webp|svg)$')
+
+# Variantes redimensionadas: las tarjetas muestran la imagen a 300px como máximo,
+# así que 150/300/600 cubren móviles y pantallas de densidad 2x
+VARIANT_WIDTHS = (150, 300, 600)
+VARIANT_FORMATS = (('webp', 'WEBP', {'quality': 80, 'method': 6}), ('png', 'PNG', {'optimize': True}))
+PLACEHOLDER_WIDTH = 16
+
+# Firmas de los formatos que aceptamos; la extensión sale de los bytes, no de la URL
+SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+# Un SVG tiene que empezar por <svg (tras la declaración XML, comentarios o el
+# DOCTYPE): una página HTML con un icono en línea no es una imagen
+SVG_RE = re.compile(
+    rb'^(\xef\xbb\xbf)?\s*(<\?xml[^>]*>\s*)?(<!--.*?-->\s*)*(<!DOCTYPE[^>]*>\s*)?(<!--.*?-->\s*)*<svg[\s>]',
+    re.DOTALL
+)
+
+
+def sniff_extension(data):
+    for signature, ext in SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if SVG_RE.match(data[:1024]):
+        return 'svg'
+    return None
+
+
+class MediaStore:
+    def __init__(self, root=MEDIA_DIR):
+        self.root = root
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def exists(self, name):
+        return os.path.isfile(self.path(name))
+
+    def put(self, data):
+        # Devuelve (sha256, ext); si ya existe no se vuelve a escribir
+        ext = sniff_extension(data)
+        if ext is None:
+            raise ValueError('formato de imagen no reconocido')
+        sha = hashlib.sha256(data).hexdigest()
+        name = f'{sha}.{ext}'
+        if not self.exists(name):
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f'{self.path(name)}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(name))
+        return sha, ext
+
+
+def build_variants(root, name):
+    # Se ejecuta en un proceso aparte: genera las variantes de una imagen y
+    # devuelve sus dimensiones, los nombres generados y un placeholder (LQIP)
+    # diminuto y desenfocado como data URI
+    sha256 = name.split('.', 1)[0]
+    with Image.open(os.path.join(root, name)) as original:
+        original.load()
+        image = original.convert('RGBA')
+    width, height = image.size
+
+    variants = []
+    widths = sorted({min(target, width) for target in VARIANT_WIDTHS})
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+        for ext, pil_format, options in VARIANT_FORMATS:
+            variant_name = f'{sha256}-{target_width}.{ext}'
+            variant_path = os.path.join(root, variant_name)
+            if not os.path.isfile(variant_path):
+                tmp_path = f'{variant_path}.{os.getpid()}.tmp'
+                resized.save(tmp_path, pil_format, **options)
+                os.replace(tmp_path, variant_path)
+            variants.append({'name': variant_name, 'format': ext, 'width': target_width, 'height': target_height})
+
+    placeholder_height = max(1, round(height * PLACEHOLDER_WIDTH / width))
+    small = image.resize((PLACEHOLDER_WIDTH, placeholder_height), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    small.save(buffer, 'PNG', optimize=True)
+    placeholder = 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+    return {'width': width, 'height': height, 'variants': variants, 'placeholder': placeholder}
+
+
+def build_all_variants(root, names, workers=None):
+    # Redimensionar es trabajo de CPU: se reparte entre procesos. Devuelve
+    # ({nombre: resultado}, [(nombre, error)])
+    if Image is None:
+        raise RuntimeError('Pillow no está instalado')
+    results = {}
+    failed = []
+    if not names:
+        return results, failed
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(build_variants, root, name) for name in names}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                failed.append((name, str(e)))
+    return results, failed
+
+
+def http_fetcher(url, timeout=30):
+    request = urllib.request.Request(url, headers={'User-Agent': 'autism-learning-app/ingest'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def directory_fetcher(directory):
+    # Busca cada imagen en un directorio local por el nombre final de su URL
+    def fetch(url):
+        name = urllib.parse.unquote(os.path.basename(urllib.parse.urlparse(url).path))
+        with open(os.path.join(directory, name), 'rb') as f:
+            return f.read()
+    return fetch
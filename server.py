@@ -1,11 +1,58 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from email.utils import formatdate, parsedate_to_datetime
+import argparse
+import gzip
 import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Variantes precomprimidas que se buscan junto a cada archivo, por preferencia
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt')
+
+
+class FileMetadataCache:
+    # Guarda por archivo los metadatos derivados (ETag, Last-Modified, tipo);
+    # solo se recalculan si cambia el mtime o el tamaño
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, stat_result, content_type):
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        metadata = {
+            'etag': f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            'last_modified': formatdate(stat_result.st_mtime, usegmt=True),
+            'mtime': int(stat_result.st_mtime),
+            'size': stat_result.st_size,
+            'content_type': content_type,
+        }
+        with self._lock:
+            self._entries[path] = (key, metadata)
+        return metadata
+
+
+metadata_cache = FileMetadataCache()
+
 
 class CORSRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Solo para desarrollo: obliga al navegador a descargar todo siempre
+    no_store = False
+
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        if self.no_store:
+            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
         return super().end_headers()
 
     def do_GET(self):
@@ -13,12 +60,129 @@ class CORSRequestHandler(SimpleHTTPRequestHandler):
             self.path = '/index.html'
         return SimpleHTTPRequestHandler.do_GET(self)
 
-def run(server_class=HTTPServer, handler_class=CORSRequestHandler, port=3001):
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or not os.path.isfile(path):
+            # Directorios, redirecciones y 404 siguen el camino estándar
+            return super().send_head()
+
+        content_type = self.guess_type(path)
+        encoding, served_path = self.choose_encoding(path)
+        try:
+            f = open(served_path, 'rb')
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+
+        try:
+            metadata = metadata_cache.get(served_path, os.fstat(f.fileno()), content_type)
+
+            if self.is_not_modified(metadata):
+                f.close()
+                self.send_response(304)
+                self.send_validators(metadata, encoding)
+                self.end_headers()
+                return None
+
+            self.send_response(200)
+            self.send_header('Content-Type', metadata['content_type'])
+            self.send_header('Content-Length', str(metadata['size']))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_validators(metadata, encoding)
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def choose_encoding(self, path):
+        accepted = {
+            token.split(';', 1)[0].strip().lower()
+            for token in self.headers.get('Accept-Encoding', '').split(',')
+        }
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding in accepted and os.path.isfile(path + suffix) \
+                    and os.path.getmtime(path + suffix) >= os.path.getmtime(path):
+                return encoding, path + suffix
+        return None, path
+
+    def is_not_modified(self, metadata):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or metadata['etag'] in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return metadata['mtime'] <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        return False
+
+    def send_validators(self, metadata, encoding):
+        self.send_header('ETag', metadata['etag'])
+        self.send_header('Last-Modified', metadata['last_modified'])
+        self.send_header('Vary', 'Accept-Encoding')
+        if not self.no_store:
+            # Se puede guardar, pero hay que revalidar (barato gracias al 304)
+            self.send_header('Cache-Control', 'no-cache')
+
+    def copyfile(self, source, outputfile):
+        # El cuerpo va directo del archivo al socket sin pasar por Python
+        offset = 0
+        try:
+            socket_fd = self.connection.fileno()
+            file_fd = source.fileno()
+            remaining = os.fstat(file_fd).st_size
+            while remaining > 0:
+                sent = os.sendfile(socket_fd, file_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except (AttributeError, OSError, ValueError):
+            # Si ya salió parte del cuerpo, reenviarlo entero excedería el
+            # Content-Length: el error corta la conexión
+            if offset:
+                raise
+            source.seek(0)
+            super().copyfile(source, outputfile)
+
+
+def precompress(directory):
+    # Genera las variantes .gz (y .br si está instalado brotli) de los archivos de texto
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+            print(f"Precomprimido: {os.path.relpath(path, directory)}")
+
+
+def run(server_class=ThreadingHTTPServer, handler_class=CORSRequestHandler, port=3001):
     server_address = ('', port)
     httpd = server_class(server_address, handler_class)
     print(f"Servidor iniciado en http://localhost:{port}")
     httpd.serve_forever()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor estático de desarrollo')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--no-store', action='store_true', help='desactiva la caché del navegador (desarrollo)')
+    parser.add_argument('--precompress', action='store_true', help='genera las variantes .gz/.br antes de arrancar')
+    args = parser.parse_args()
+
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    run() 
\ No newline at end of file
+    CORSRequestHandler.no_store = args.no_store
+    if args.precompress:
+        precompress('.')
+    run(port=args.port)
@@ -0,0 +1,240 @@
+let currentCardIndex = 0;
+let cards = [];
+let score = 0;
+let selectedOption = null;
+let cardShownAt = 0;
+let category = window.location.pathname.split('/')[1];
+
+// Respuestas pendientes de enviar; se guardan en localStorage para poder
+// reintentar el envío si la red falla
+const PENDING_ANSWERS_KEY = 'pendingAnswers';
+// Máximo de respuestas por petición (ANSWER_BATCH_MAX en el servidor)
+const ANSWER_BATCH_MAX = Number(document.currentScript.dataset.answerBatchMax) || 500;
+let pendingAnswers = loadPendingAnswers();
+
+// Elementos del DOM
+const questionEl = document.getElementById('question');
+const questionImageEl = document.getElementById('questionImage');
+const questionImageWebpEl = document.getElementById('questionImageWebp');
+const optionsEl = document.getElementById('options');
+const feedbackEl = document.getElementById('feedback');
+const nextButton = document.getElementById('nextButton');
+const progressBar = document.getElementById('progressBar');
+
+// Las tarjetas llegan por páginas; mientras se responde una página se
+// descarga la siguiente en segundo plano
+const PAGE_SIZE = 20;
+let totalCards = 0;
+let nextCursor = null;
+let nextPage = null;
+
+async function fetchPage(after) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (after !== null) {
+        params.set('after', after);
+    }
+    const response = await fetch(`/api/flashcards/${category}?${params}`);
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    return response.json();
+}
+
+function appendPage(page) {
+    cards = cards.concat(page.cards);
+    totalCards = page.total || cards.length;
+    nextCursor = page.next_cursor;
+    nextPage = null;
+    prefetchNextPage();
+}
+
+function prefetchNextPage() {
+    if (nextCursor === null || nextPage !== null) return;
+    nextPage = fetchPage(nextCursor);
+    nextPage.catch((error) => {
+        console.error('Error precargando flashcards:', error);
+        nextPage = null;
+    });
+}
+
+// Cargar las flashcards
+async function loadFlashcards() {
+    try {
+        appendPage(await fetchPage(null));
+        showCard(currentCardIndex);
+    } catch (error) {
+        console.error('Error cargando flashcards:', error);
+    }
+}
+
+// Mostrar una tarjeta
+async function showCard(index) {
+    if (index >= cards.length && nextCursor !== null) {
+        nextButton.style.display = 'none';
+        try {
+            prefetchNextPage();
+            appendPage(await nextPage);
+        } catch (error) {
+            console.error('Error cargando flashcards:', error);
+            return;
+        }
+    }
+    if (index >= cards.length) {
+        saveProgress();
+        return;
+    }
+
+    const card = cards[index];
+    questionEl.textContent = card.question;
+    showImage(card);
+
+    optionsEl.innerHTML = '';
+    card.options.forEach((option, i) => {
+        const button = document.createElement('button');
+        button.className = 'option';
+        button.textContent = option;
+        button.onclick = () => selectOption(i);
+        optionsEl.appendChild(button);
+    });
+
+    feedbackEl.style.display = 'none';
+    nextButton.style.display = 'none';
+    selectedOption = null;
+    cardShownAt = Date.now();
+
+    updateProgressBar();
+}
+
+// Imagen de la tarjeta: con las dimensiones reservamos el hueco antes de que
+// llegue y el placeholder desenfocado se ve mientras tanto
+function showImage(card) {
+    questionImageWebpEl.srcset = card.image_srcset_webp || '';
+    questionImageEl.srcset = card.image_srcset || '';
+    if (card.image_width && card.image_height) {
+        questionImageEl.width = card.image_width;
+        questionImageEl.height = card.image_height;
+    } else {
+        questionImageEl.removeAttribute('width');
+        questionImageEl.removeAttribute('height');
+    }
+    questionImageEl.style.backgroundImage = card.image_placeholder ? `url("${card.image_placeholder}")` : '';
+    questionImageEl.src = card.image_url;
+}
+
+// Las imágenes tienen transparencia: quitamos el placeholder al cargar
+questionImageEl.onload = () => {
+    questionImageEl.style.backgroundImage = '';
+};
+
+// Seleccionar una opción
+function selectOption(index) {
+    if (selectedOption !== null) return;
+
+    selectedOption = index;
+    const card = cards[currentCardIndex];
+    bufferAnswer(card, index);
+    const options = document.querySelectorAll('.option');
+
+    options[index].classList.add('selected');
+
+    if (index === card.correct_option) {
+        score++;
+        options[index].classList.add('correct');
+        feedbackEl.className = 'feedback correct';
+        feedbackEl.textContent = card.feedback;
+    } else {
+        options[index].classList.add('incorrect');
+        options[card.correct_option].classList.add('correct');
+        feedbackEl.className = 'feedback incorrect';
+        feedbackEl.textContent = 'Intenta de nuevo. ' + card.feedback;
+    }
+
+    feedbackEl.style.display = 'block';
+    nextButton.style.display = 'block';
+}
+
+// Actualizar la barra de progreso
+function updateProgressBar() {
+    const progress = ((currentCardIndex + 1) / (totalCards || cards.length)) * 100;
+    progressBar.style.width = `${progress}%`;
+}
+
+function loadPendingAnswers() {
+    try {
+        return JSON.parse(localStorage.getItem(PENDING_ANSWERS_KEY)) || [];
+    } catch (error) {
+        return [];
+    }
+}
+
+function storePendingAnswers() {
+    localStorage.setItem(PENDING_ANSWERS_KEY, JSON.stringify(pendingAnswers));
+}
+
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+}
+
+function bufferAnswer(card, option) {
+    pendingAnswers.push({
+        card_id: card.id,
+        option: option,
+        answered_at: new Date().toISOString(),
+        latency_ms: Date.now() - cardShownAt,
+        idempotency_key: newIdempotencyKey()
+    });
+    storePendingAnswers();
+}
+
+// Envía las respuestas pendientes en lotes de como mucho ANSWER_BATCH_MAX
+async function uploadAnswers() {
+    let ok = true;
+    while (pendingAnswers.length > 0) {
+        const batch = pendingAnswers.slice(0, ANSWER_BATCH_MAX);
+        const response = await fetch('/api/answers/batch', {
+            method: 'POST',
+            redirect: 'manual',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ answers: batch })
+        });
+        // Sesión caducada: las respuestas se conservan hasta volver a entrar
+        if (response.status === 401 || response.type === 'opaqueredirect') {
+            window.location.href = '/login';
+            return false;
+        }
+        if (response.status >= 500) {
+            return false;
+        }
+        // Con 2xx el lote quedó aplicado; con 4xx reintentarlo no serviría
+        pendingAnswers = pendingAnswers.slice(batch.length);
+        storePendingAnswers();
+        ok = ok && response.ok;
+    }
+    return ok;
+}
+
+// Guardar el progreso
+async function saveProgress() {
+    try {
+        if (await uploadAnswers()) {
+            window.location.href = '/dashboard';
+        }
+    } catch (error) {
+        console.error('Error guardando progreso:', error);
+    }
+}
+
+// Evento para el botón siguiente
+nextButton.onclick = () => {
+    currentCardIndex++;
+    showCard(currentCardIndex);
+};
+
+// Cargar las flashcards al iniciar y reintentar el envío de respuestas pendientes
+loadFlashcards();
+uploadAnswers().catch((error) => console.error('Error enviando respuestas pendientes:', error));
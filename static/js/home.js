@@ -0,0 +1,88 @@
+let isLoginForm = true;
+
+function toggleForms() {
+    const loginForm = document.getElementById('loginForm');
+    const registerForm = document.getElementById('registerForm');
+    const authInfo = document.querySelector('.auth-info');
+
+    if (isLoginForm) {
+        loginForm.style.display = 'none';
+        registerForm.style.display = 'block';
+        authInfo.innerHTML = `
+            <h2>¿Ya tienes una cuenta?</h2>
+            <p>Inicia sesión para continuar aprendiendo</p>
+            <button onclick="toggleForms()" style="background: white; color: #0091FF;">Iniciar Sesión</button>
+        `;
+    } else {
+        loginForm.style.display = 'block';
+        registerForm.style.display = 'none';
+        authInfo.innerHTML = `
+            <h2>¿Aún no tienes una cuenta?</h2>
+            <p>Regístrate para que puedas iniciar sesión</p>
+            <button onclick="toggleForms()" style="background: white; color: #0091FF;">Registrarse</button>
+        `;
+    }
+    isLoginForm = !isLoginForm;
+}
+
+async function handleLogin(event) {
+    event.preventDefault();
+    const form = event.target;
+    const formData = new FormData(form);
+    const data = Object.fromEntries(formData.entries());
+
+    try {
+        const response = await fetch('/login', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        if (response.ok) {
+            document.getElementById('loginSuccess').style.display = 'block';
+            document.getElementById('loginSuccess').textContent = '¡Inicio de sesión exitoso!';
+            window.location.href = '/dashboard';
+        } else {
+            const error = await response.json();
+            document.getElementById('loginError').style.display = 'block';
+            document.getElementById('loginError').textContent = error.error || 'Error al iniciar sesión';
+        }
+    } catch (error) {
+        document.getElementById('loginError').style.display = 'block';
+        document.getElementById('loginError').textContent = 'Error de conexión';
+    }
+}
+
+async function handleRegister(event) {
+    event.preventDefault();
+    const form = event.target;
+    const formData = new FormData(form);
+    const data = Object.fromEntries(formData.entries());
+
+    try {
+        const response = await fetch('/register', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        if (response.ok) {
+            document.getElementById('registerSuccess').style.display = 'block';
+            document.getElementById('registerSuccess').textContent = '¡Registro exitoso! Redirigiendo...';
+            setTimeout(() => {
+                toggleForms();
+            }, 2000);
+        } else {
+            const error = await response.json();
+            document.getElementById('registerError').style.display = 'block';
+            document.getElementById('registerError').textContent = error.error || 'Error al registrarse';
+        }
+    } catch (error) {
+        document.getElementById('registerError').style.display = 'block';
+        document.getElementById('registerError').textContent = 'Error de conexión';
+    }
+}
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# La aplicación lee la configuración al importarse: base SQLite, caché de
+# plantillas y almacén de imágenes temporales antes del primer import
+_workdir = tempfile.mkdtemp(prefix='autism-learning-tests-')
+os.environ.pop('DATABASE_URL', None)
+os.environ['SQLITE_PATH'] = os.path.join(_workdir, 'test.db')
+os.environ['TEMPLATE_CACHE_DIR'] = os.path.join(_workdir, 'jinja')
+os.environ['MEDIA_DIR'] = os.path.join(_workdir, 'media')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app, init_db
+
+    flask_app.config['SESSION_COOKIE_SECURE'] = False
+    with flask_app.app_context():
+        assert init_db()
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    # Cliente con un usuario nuevo ya autenticado
+    client = app.test_client()
+    email = f'test-{uuid.uuid4().hex[:12]}@example.com'
+    assert client.post('/register', json={'name': 'Test', 'email': email, 'password': 'password123'}).status_code == 201
+    assert client.post('/login', json={'email': email, 'password': 'password123'}).status_code == 200
+    return client
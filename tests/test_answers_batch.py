@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime
+
+
+def test_api_without_session_gets_401_json(app):
+    client = app.test_client()
+    response = client.post('/api/answers/batch', json={'answers': []})
+    assert response.status_code == 401
+    assert response.is_json
+
+    page = client.get('/dashboard')
+    assert page.status_code == 302
+    assert page.headers['Location'].endswith('/login')
+
+
+def test_quiz_uploaded_in_two_batches_completes(app, client):
+    from app import db, Category, Flashcard
+
+    category = 'lotes-test'
+    with app.app_context():
+        db.session.add(Category(key=category, name='Lotes', icon='🧪', color='#9E9E9E', description='', sort_order=99))
+        cards = [Flashcard(category=category, question=f'Pregunta {n}', options=['Sí', 'No'],
+                           correct_option=0, feedback='Bien') for n in range(3)]
+        db.session.add_all(cards)
+        db.session.commit()
+        ids = [card.id for card in cards]
+
+    def upload(card_ids):
+        response = client.post('/api/answers/batch', json={'answers': [{
+            'card_id': card_id, 'option': 0, 'answered_at': datetime.utcnow().isoformat() + 'Z',
+            'idempotency_key': uuid.uuid4().hex
+        } for card_id in card_ids]})
+        assert response.status_code == 200, response.data
+        return response.get_json()['progress'][category]
+
+    try:
+        first = upload(ids[:2])
+        assert (first['completed_cards'], first['completed']) == (2, False)
+        second = upload(ids[2:])
+        assert second == {'score': 3, 'percentage': 100.0, 'completed_cards': 3, 'completed': True}
+    finally:
+        with app.app_context():
+            Flashcard.query.filter_by(category=category).delete()
+            Category.query.filter_by(key=category).delete()
+            db.session.info['categories_changed'] = True
+            db.session.commit()
+
+
+def test_client_times_are_clamped_to_server_time(app, client):
+    from datetime import timedelta
+    from app import CardReviewState, Flashcard
+
+    with app.app_context():
+        card_ids = [card.id for card in Flashcard.query.filter_by(category='emociones').order_by(Flashcard.id).limit(3)]
+    times = ['9999-12-31T23:00:00Z', '2030-01-01T00:00:00Z', 'ayer']
+    response = client.post('/api/answers/batch', json={'answers': [{
+        'card_id': card_id, 'option': 0, 'answered_at': answered_at, 'idempotency_key': uuid.uuid4().hex
+    } for card_id, answered_at in zip(card_ids, times)]})
+    assert response.status_code == 200, response.data
+    body = response.get_json()
+    assert body['accepted'] == 2
+    assert [row['error'] for row in body['rejected']] == ['Fecha no válida']
+
+    # Una respuesta correcta programa el siguiente repaso como mucho unos días después de hoy
+    with app.app_context():
+        limit = datetime.utcnow() + timedelta(days=7)
+        for state in CardReviewState.query.filter(CardReviewState.card_id.in_(card_ids[:2])):
+            assert state.due_at < limit
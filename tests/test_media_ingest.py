@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+CATEGORY = 'ingesta-test'
+PNG = b'\x89PNG\r\n\x1a\n' + b'imagen de prueba'
+REMOTE = {
+    'https://img.example.com/a.png': PNG,
+    'https://cdn.example.com/copia-de-a.png': PNG,
+}
+MISSING_URL = 'https://img.example.com/no-existe.png'
+
+
+def dict_fetcher(url):
+    # Como directory_fetcher: una imagen que no está es un OSError
+    try:
+        return REMOTE[url]
+    except KeyError:
+        raise FileNotFoundError(url)
+
+
+@pytest.fixture
+def deck(app):
+    from app import db, Flashcard, ImageAsset, mark_decks_changed, media_store
+
+    urls = list(REMOTE) + [MISSING_URL]
+    with app.app_context():
+        for n, url in enumerate(urls):
+            db.session.add(Flashcard(
+                category=CATEGORY, question=f'Pregunta {n}', image_url=url,
+                options=['Sí', 'No'], correct_option=0, feedback='Bien'
+            ))
+        db.session.commit()
+    yield urls
+    # Los borrados masivos no disparan eventos del ORM: se invalidan a mano el
+    # mazo y el mapa de imágenes, y se borran los archivos importados
+    with app.app_context():
+        assets = ImageAsset.query.filter(ImageAsset.source_url.in_(urls))
+        names = {f'{asset.sha256}.{asset.ext}' for asset in assets}
+        Flashcard.query.filter_by(category=CATEGORY).delete()
+        assets.delete()
+        mark_decks_changed(db.session, [CATEGORY])
+        db.session.info['images_changed'] = True
+        db.session.commit()
+    for name in names:
+        if media_store.exists(name):
+            os.remove(media_store.path(name))
+
+
+def test_ingest_rewrites_urls_and_deduplicates_files(app, client, deck):
+    from app import ImageAsset, ingest_card_images, media_store
+
+    before = client.get(f'/api/flashcards/{CATEGORY}')
+    assert before.status_code == 200
+    assert [card['image_url'] for card in before.get_json()] == deck
+
+    with app.app_context():
+        imported, failed = ingest_card_images(dict_fetcher)
+        assets = {asset.source_url: asset for asset in ImageAsset.query.filter(ImageAsset.source_url.in_(deck))}
+        assets = {url: (asset.sha256, asset.ext, asset.size) for url, asset in assets.items()}
+
+    assert imported == 2
+    assert MISSING_URL in [url for url, _ in failed]
+
+    # Los mismos bytes desde dos URLs: dos filas y un único archivo
+    assert set(assets) == set(REMOTE)
+    assert len(set(assets.values())) == 1
+    sha256, ext, size = next(iter(assets.values()))
+    assert (ext, size) == ('png', len(PNG))
+    assert [name for name in os.listdir(media_store.root) if name.startswith(sha256)] == [f'{sha256}.{ext}']
+
+    # El mazo en caché se invalida y las URLs pasan a /media; la que falló se queda igual
+    after = client.get(f'/api/flashcards/{CATEGORY}')
+    assert after.status_code == 200
+    assert after.headers['ETag'] != before.headers['ETag']
+    urls = [card['image_url'] for card in after.get_json()]
+    assert urls == [f'/media/{sha256}.png', f'/media/{sha256}.png', MISSING_URL]
+    assert client.get(urls[0]).data == PNG
+
+
+def test_html_with_inline_svg_is_not_an_image():
+    from media import sniff_extension
+
+    assert sniff_extension(b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg"></svg>') == 'svg'
+    assert sniff_extension(b'<!DOCTYPE html><html><body><svg></svg><script>alert(1)</script>') is None
+
+
+def test_svg_is_served_sandboxed(app, client):
+    from app import media_store
+
+    sha256, ext = media_store.put(b'<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+    try:
+        response = client.get(f'/media/{sha256}.{ext}')
+        assert response.status_code == 200
+        assert response.headers['Content-Security-Policy'] == 'sandbox'
+        assert response.headers['X-Content-Type-Options'] == 'nosniff'
+    finally:
+        os.remove(media_store.path(f'{sha256}.{ext}'))
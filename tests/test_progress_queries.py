@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def count_queries(app):
+    from app import db
+
+    def count(client, path):
+        with app.app_context():
+            engine = db.engine
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = client.get(path)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        assert response.status_code == 200
+        return len(statements)
+
+    return count
+
+
+PAGES = ['/dashboard', '/progress', '/get-all-progress']
+
+
+def progress_queries(client, count_queries):
+    client.post('/save-progress', json={'category': 'emociones', 'score': 2, 'percentage': 66.7})
+    for path in PAGES:
+        client.get(path)  # registro y usuario en caché
+    return {path: count_queries(client, path) for path in PAGES}
+
+
+def test_progress_pages_query_count_is_small(client, count_queries):
+    default = progress_queries(client, count_queries)
+    for path, queries in default.items():
+        assert queries <= 2, f'{path}: {queries} consultas'
+
+
+def test_progress_pages_same_query_count_for_3_and_n_categories(app, client, count_queries):
+    from app import db, Category
+
+    default = progress_queries(client, count_queries)
+    keys = [f'more-{n}' for n in range(20)]
+    with app.app_context():
+        for n, key in enumerate(keys):
+            db.session.add(Category(key=key, name=f'More {n}', sort_order=80 + n))
+        db.session.commit()
+    try:
+        with_more = progress_queries(client, count_queries)
+        assert len(client.get('/get-all-progress').get_json()) == 3 + len(keys)
+    finally:
+        with app.app_context():
+            Category.query.filter(Category.key.in_(keys)).delete(synchronize_session=False)
+            db.session.info['categories_changed'] = True
+            db.session.commit()
+    assert with_more == default
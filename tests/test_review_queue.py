@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+CATEGORY = 'repaso-test'
+
+
+@pytest.fixture
+def deck(app):
+    from app import db, Flashcard, NewCardCursor
+
+    with app.app_context():
+        cards = [Flashcard(category=CATEGORY, question=f'Pregunta {n}', options=['Sí', 'No'],
+                           correct_option=0, feedback='Bien') for n in range(6)]
+        db.session.add_all(cards)
+        db.session.commit()
+        ids = [card.id for card in cards]
+    yield ids
+    with app.app_context():
+        NewCardCursor.query.filter_by(category=CATEGORY).delete()
+        Flashcard.query.filter_by(category=CATEGORY).delete()
+        db.session.commit()
+
+
+def answer(client, card_ids):
+    # Respuestas correctas de ahora: las tarjetas no vuelven a tocar hasta mañana
+    answered_at = datetime.utcnow().isoformat() + 'Z'
+    response = client.post('/api/answers/batch', json={'answers': [{
+        'card_id': card_id, 'option': 0, 'answered_at': answered_at,
+        'idempotency_key': uuid.uuid4().hex
+    } for card_id in card_ids]})
+    assert response.status_code == 200, response.data
+
+
+def new_card_ids(client):
+    response = client.get(f'/api/review/due?category={CATEGORY}&limit=3')
+    assert response.status_code == 200
+    return [card['id'] for card in response.get_json()['cards'] if card['new']]
+
+
+def cursor_position(app):
+    from app import NewCardCursor
+
+    with app.app_context():
+        return [cursor.last_seen_id for cursor in NewCardCursor.query.filter_by(category=CATEGORY)]
+
+
+def test_new_cards_start_at_the_cursor(app, client, deck):
+    assert new_card_ids(client) == deck[:3]
+    assert cursor_position(app) == [deck[0] - 1]
+
+    # Vistas fuera de orden: el cursor solo pasa las que están todas vistas
+    answer(client, [deck[0], deck[1], deck[3]])
+    assert new_card_ids(client) == [deck[2], deck[4], deck[5]]
+    assert cursor_position(app) == [deck[1]]
+
+    answer(client, [deck[2], deck[4], deck[5]])
+    assert new_card_ids(client) == []
+    assert cursor_position(app) == [deck[5]]
+
+
+def test_card_moved_into_category_resets_cursor(app, client, deck):
+    from app import db, Flashcard
+
+    answer(client, deck)
+    assert new_card_ids(client) == []
+    with app.app_context():
+        moved = Flashcard.query.filter(Flashcard.category != CATEGORY).order_by(Flashcard.id).first()
+        moved_id, original = moved.id, moved.category
+        moved.category = CATEGORY
+        db.session.commit()
+    try:
+        assert cursor_position(app) == []
+        assert new_card_ids(client) == [moved_id]
+    finally:
+        with app.app_context():
+            db.session.get(Flashcard, moved_id).category = original
+            db.session.commit()
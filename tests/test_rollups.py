@@ -0,0 +1,25 @@
+def test_rebuild_keeps_rollup_counters(app, client):
+    from app import db, ProgressRollup, rebuild_progress_rollups, check_progress_rollups
+
+    for score in (1, 3, 2):
+        response = client.post('/save-progress', json={
+            'category': 'entorno', 'score': score, 'percentage': score * 33.3, 'completed': True
+        })
+        assert response.status_code == 200
+
+    with app.app_context():
+        rollups = ProgressRollup.query.filter_by(category='entorno').all()
+        before = {row.user_id: (row.attempts, row.completed_count) for row in rollups}
+        # Un resumen estropeado se repara sin perder el historial de intentos
+        for row in rollups:
+            row.best_score = 0
+        db.session.commit()
+
+        rebuild_progress_rollups()
+        after = {row.user_id: (row.attempts, row.completed_count, row.best_score)
+                 for row in ProgressRollup.query.filter_by(category='entorno')}
+        assert check_progress_rollups() == []
+
+    assert (3, 3) in before.values()
+    assert {user: counters[:2] for user, counters in after.items()} == before
+    assert all(best_score > 0 for _, _, best_score in after.values())
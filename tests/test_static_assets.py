@@ -0,0 +1,20 @@
+import gzip
+
+
+def test_dist_files_are_served_precompressed(app):
+    from assets import build_assets
+
+    manifest = build_assets(app.static_folder)
+    client = app.test_client()
+    url = '/static/' + manifest['js/flashcards.js']
+    plain = client.get(url)
+    assert plain.status_code == 200
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert compressed.status_code == 200
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.mimetype == plain.mimetype
+    assert 'immutable' in compressed.headers['Cache-Control']
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data